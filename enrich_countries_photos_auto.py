@@ -10,11 +10,13 @@ Usage:
 
 Features:
     - Gets 2 photos per country for comparison
+    - Fetches countries concurrently (one query at a time per country)
     - Auto-sleeps for 1h10 when rate limit hit
     - Continues automatically until all countries are processed
     - Perfect for overnight runs
 """
 
+import asyncio
 import sys
 import logging
 import time
@@ -22,7 +24,7 @@ from typing import Optional
 from datetime import datetime
 
 from src.database import Database
-from src.scrapers.unsplash_photos import UnsplashPhotoScraper, get_country_photo_with_fallbacks
+from src.scrapers.unsplash_photos import UnsplashPhotoScraper
 from src.config import settings
 
 logging.basicConfig(
@@ -69,110 +71,82 @@ class CountryPhotoEnricherAuto:
             logger.info("🌙 AUTO MODE: Will sleep 1h10 when rate limit is hit")
             logger.info("=" * 70)
 
-            # Fetch countries
-            cursor = countries_collection.find(query)
-            consecutive_failures = 0
-            max_consecutive_failures = 2  # After 2 consecutive 403s, we know we hit the limit
-
-            for country_doc in cursor:
+            # Collect the countries that still need photos
+            pending = []
+            for country_doc in countries_collection.find(query):
                 stats["processed"] += 1
-                country_name = country_doc.get("name", "Unknown")
-                country_code = country_doc.get("code_iso2", "??")
-
-                logger.info(f"[{stats['processed']}/{stats['total']}] Processing: {country_name} ({country_code})")
 
-                # Skip if already has photos
                 if country_doc.get("photo_url_1") and country_doc.get("photo_url_2"):
-                    logger.info(f"  ↳ Already has 2 photos, skipping")
                     stats["already_has_photo"] += 1
                     stats["skipped"] += 1
-                    consecutive_failures = 0  # Reset on success
                     continue
 
-                # Fetch photos from Unsplash
-                try:
-                    photos_data = get_country_photo_with_fallbacks(self.scraper, country_name)
-
-                    if photos_data and len(photos_data) > 0:
-                        logger.info(f"  ✓ Found {len(photos_data)} photo(s) for {country_name}")
-
-                        # Prepare update data for 2 photos
-                        update_data = {}
-
-                        for idx, photo in enumerate(photos_data[:2], 1):
-                            logger.info(f"    Photo {idx}: {photo['photo_url'][:60]}...")
-                            logger.info(f"    Credit {idx}: {photo['photo_credit']}")
-
-                            update_data[f"photo_url_{idx}"] = photo["photo_url"]
-                            update_data[f"photo_credit_{idx}"] = photo["photo_credit"]
-                            update_data[f"photo_source_{idx}"] = photo["photo_source"]
-
-                        # Update MongoDB document
-                        countries_collection.update_one(
-                            {"_id": country_doc["_id"]},
-                            {"$set": update_data}
-                        )
-                        stats["updated"] += 1
-                        consecutive_failures = 0  # Reset on success
-                    else:
-                        logger.warning(f"  ✗ No photo found for {country_name}")
-                        stats["failed"] += 1
-                        # Don't reset consecutive_failures here, keep counting
+                pending.append(country_doc)
+
+            logger.info(f"{len(pending)} countries need photos ({stats['already_has_photo']} already have 2)")
 
+            # Fetch all photos concurrently; on a rate limit, sleep and resume
+            # (countries already found are memoized by the scraper, so only the
+            # remaining ones are queried again)
+            names = [doc.get("name", "Unknown") for doc in pending]
+            while True:
+                try:
+                    photos_by_country = asyncio.run(self.scraper.fetch_country_photos(names))
+                    break
                 except Exception as e:
                     error_message = str(e)
+                    if "403" not in error_message and "Forbidden" not in error_message:
+                        raise
+
+                    stats["rate_limit_pauses"] += 1
+                    logger.warning("")
+                    logger.warning("=" * 70)
+                    logger.warning("⏰ RATE LIMIT REACHED!")
+                    logger.warning(f"   Sleeping for 1h10 (70 minutes)...")
+                    logger.warning(f"   Current time: {datetime.now().strftime('%H:%M:%S')}")
+                    logger.warning(f"   Will resume at: {datetime.fromtimestamp(time.time() + self.rate_limit_sleep_seconds).strftime('%H:%M:%S')}")
+                    logger.warning("=" * 70)
+                    logger.warning("")
+
+                    time.sleep(self.rate_limit_sleep_seconds)
+
+                    logger.info("")
+                    logger.info("=" * 70)
+                    logger.info("✅ Sleep completed! Resuming enrichment...")
+                    logger.info("=" * 70)
+                    logger.info("")
+
+            for idx, country_doc in enumerate(pending, 1):
+                country_name = country_doc.get("name", "Unknown")
+                country_code = country_doc.get("code_iso2", "??")
+                photos_data = photos_by_country.get(country_name)
+
+                logger.info(f"[{idx}/{len(pending)}] {country_name} ({country_code})")
+
+                if not photos_data:
+                    logger.warning(f"  ✗ No photo found for {country_name}")
+                    stats["failed"] += 1
+                    continue
+
+                logger.info(f"  ✓ Found {len(photos_data)} photo(s) for {country_name}")
+
+                # Prepare update data for 2 photos
+                update_data = {}
+
+                for photo_idx, photo in enumerate(photos_data[:2], 1):
+                    logger.info(f"    Photo {photo_idx}: {photo['photo_url'][:60]}...")
+                    logger.info(f"    Credit {photo_idx}: {photo['photo_credit']}")
+
+                    update_data[f"photo_url_{photo_idx}"] = photo["photo_url"]
+                    update_data[f"photo_credit_{photo_idx}"] = photo["photo_credit"]
+                    update_data[f"photo_source_{photo_idx}"] = photo["photo_source"]
 
-                    # Check if it's a rate limit error (403)
-                    if "403" in error_message or "Forbidden" in error_message:
-                        consecutive_failures += 1
-                        logger.warning(f"  ✗ Rate limit hit for {country_name} (consecutive: {consecutive_failures})")
-
-                        # If we've had multiple consecutive 403s, we're rate limited
-                        if consecutive_failures >= max_consecutive_failures:
-                            stats["rate_limit_pauses"] += 1
-                            logger.warning("")
-                            logger.warning("=" * 70)
-                            logger.warning("⏰ RATE LIMIT REACHED!")
-                            logger.warning(f"   Sleeping for 1h10 (70 minutes)...")
-                            logger.warning(f"   Current time: {datetime.now().strftime('%H:%M:%S')}")
-                            logger.warning(f"   Will resume at: {datetime.fromtimestamp(time.time() + self.rate_limit_sleep_seconds).strftime('%H:%M:%S')}")
-                            logger.warning("=" * 70)
-                            logger.warning("")
-
-                            time.sleep(self.rate_limit_sleep_seconds)
-
-                            logger.info("")
-                            logger.info("=" * 70)
-                            logger.info("✅ Sleep completed! Resuming enrichment...")
-                            logger.info("=" * 70)
-                            logger.info("")
-
-                            consecutive_failures = 0  # Reset after sleep
-
-                            # Retry the current country
-                            try:
-                                photos_data = get_country_photo_with_fallbacks(self.scraper, country_name)
-                                if photos_data and len(photos_data) > 0:
-                                    update_data = {}
-                                    for idx, photo in enumerate(photos_data[:2], 1):
-                                        update_data[f"photo_url_{idx}"] = photo["photo_url"]
-                                        update_data[f"photo_credit_{idx}"] = photo["photo_credit"]
-                                        update_data[f"photo_source_{idx}"] = photo["photo_source"]
-
-                                    countries_collection.update_one(
-                                        {"_id": country_doc["_id"]},
-                                        {"$set": update_data}
-                                    )
-                                    stats["updated"] += 1
-                                    logger.info(f"  ✓ Successfully updated {country_name} after rate limit pause")
-                                else:
-                                    stats["failed"] += 1
-                            except Exception as retry_error:
-                                logger.error(f"  ✗ Failed to update {country_name} even after pause: {retry_error}")
-                                stats["failed"] += 1
-                    else:
-                        logger.error(f"  ✗ Error processing {country_name}: {e}")
-                        stats["failed"] += 1
+                # Update MongoDB document
+                countries_collection.update_one(
+                    {"_id": country_doc["_id"]},
+                    {"$set": update_data}
+                )
+                stats["updated"] += 1
 
             # Print summary
             logger.info("\n" + "=" * 70)
@@ -13,6 +13,9 @@ class Settings(BaseSettings):
     # Unsplash API for country photos
     UNSPLASH_API_KEY: str = ""
 
+    # Wall-clock budget for the whole LLM budget-estimation phase
+    LLM_WALL_TIMEOUT_S: float = 300.0
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -1,13 +1,53 @@
 from pymongo import MongoClient, UpdateOne
-from pymongo.errors import ConnectionFailure
+from pymongo.errors import BulkWriteError, ConnectionFailure
 from src.config import settings
 from src.models import Country, City
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterable, Iterator
+from itertools import islice
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Operations sent per bulk_write round trip
+UPSERT_BATCH_SIZE = 2000
+
+
+def _chunk(iterable: Iterable, n: int = UPSERT_BATCH_SIZE) -> Iterator[list]:
+    """Yield successive lists of at most n items."""
+    it = iter(iterable)
+    while batch := list(islice(it, n)):
+        yield batch
+
+
+def _bulk_write_chunked(collection, operations: Iterable) -> Tuple[int, int, int]:
+    """
+    Run operations as unordered bulk_write batches, returning (matched, modified, upserted) totals.
+
+    Rejected documents are logged and counted per batch instead of aborting
+    the remaining batches.
+    """
+    matched = modified = upserted = failed = 0
+    for batch in _chunk(operations):
+        try:
+            result = collection.bulk_write(batch, ordered=False)
+            matched += result.matched_count
+            modified += result.modified_count
+            upserted += result.upserted_count
+        except BulkWriteError as e:
+            # Unordered: every other operation of the batch was still applied
+            details = e.details
+            matched += details.get("nMatched", 0)
+            modified += details.get("nModified", 0)
+            upserted += details.get("nUpserted", 0)
+            failed += len(details.get("writeErrors", []))
+            for error in details.get("writeErrors", [])[:3]:
+                logger.debug(f"Write error in {collection.name}: {error.get('errmsg')}")
+
+    if failed:
+        logger.error(f"{failed} writes to {collection.name} failed")
+    return matched, modified, upserted
+
 class Database:
     def __init__(self):
         self.client = None
@@ -35,6 +75,8 @@ class Database:
             
             # Create indexes
             self.countries.create_index("code_iso2", unique=True)
+            # Lets the photo verification list countries without photo without a COLLSCAN
+            self.countries.create_index([("photo_url", 1)], name="photo_url")
             self.cities.create_index([("name", 1), ("country_code", 1)], unique=True)
             
             logger.info("Successfully connected to MongoDB")
@@ -46,37 +88,33 @@ class Database:
         if not countries:
             return
             
-        operations = []
-        for country in countries:
-            operations.append(
-                UpdateOne(
-                    {"code_iso2": country.code_iso2},
-                    {"$set": country.model_dump()},
-                    upsert=True
-                )
+        operations = (
+            UpdateOne(
+                {"code_iso2": country.code_iso2},
+                {"$set": country.model_dump()},
+                upsert=True
             )
-        
-        if operations:
-            result = self.countries.bulk_write(operations)
-            logger.info(f"Upserted {len(countries)} countries. Modified: {result.modified_count}, Upserted: {result.upserted_count}")
+            for country in countries
+        )
+
+        _, modified, upserted = _bulk_write_chunked(self.countries, operations)
+        logger.info(f"Upserted {len(countries)} countries. Modified: {modified}, Upserted: {upserted}")
 
     def upsert_cities(self, cities: List[City]):
         if not cities:
             return
 
-        operations = []
-        for city in cities:
-            operations.append(
-                UpdateOne(
-                    {"name": city.name, "country_code": city.country_code},
-                    {"$set": city.model_dump()},
-                    upsert=True
-                )
+        operations = (
+            UpdateOne(
+                {"name": city.name, "country_code": city.country_code},
+                {"$set": city.model_dump()},
+                upsert=True
             )
-            
-        if operations:
-            result = self.cities.bulk_write(operations)
-            logger.info(f"Upserted {len(cities)} cities. Modified: {result.modified_count}, Upserted: {result.upserted_count}")
+            for city in cities
+        )
+
+        _, modified, upserted = _bulk_write_chunked(self.cities, operations)
+        logger.info(f"Upserted {len(cities)} cities. Modified: {modified}, Upserted: {upserted}")
 
     def update_country_budgets(self, budget_data: Dict[str, Tuple[float, float]]):
         """
@@ -89,24 +127,27 @@ class Database:
             logger.warning("No budget data to update")
             return
 
-        operations = []
-        for iso2, (min_budget, max_budget) in budget_data.items():
-            operations.append(
-                UpdateOne(
-                    {"code_iso2": iso2},
-                    {
-                        "$set": {
-                            "daily_budget_min": min_budget,
-                            "daily_budget_max": max_budget,
-                            "last_updated": datetime.utcnow()
-                        }
+        now = datetime.utcnow()
+        operations = (
+            UpdateOne(
+                {"code_iso2": iso2},
+                {
+                    "$set": {
+                        "daily_budget_min": min_budget,
+                        "daily_budget_max": max_budget,
+                        "last_updated": now
                     }
-                )
+                }
             )
+            for iso2, (min_budget, max_budget) in budget_data.items()
+        )
 
-        if operations:
-            result = self.countries.bulk_write(operations)
-            logger.info(f"Updated budgets for {result.modified_count} countries")
+        # Update-only: countries are created by the rare sync, so a budget for an
+        # unknown code costs one unmatched update instead of an upsert
+        matched, modified, _ = _bulk_write_chunked(self.countries, operations)
+        logger.info(f"Updated budgets for {modified} countries")
+        if matched < len(budget_data):
+            logger.warning(f"{len(budget_data) - matched} budgets matched no existing country")
 
     def close(self):
         if self.client:
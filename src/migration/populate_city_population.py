@@ -18,6 +18,7 @@ Environment Variables:
     MAX_RADIUS_KM: Maximum distance for matching (default: 30)
     WIKIDATA_MAX_QPS: Wikidata API rate limit (default: 2)
     BATCH_SIZE: Database batch size (default: 2000)
+    FETCH_ITERSIZE: Rows per server-side cursor round-trip (default: 10000)
     ONLY_NULL: Only update NULL populations (default: 1)
 """
 
@@ -25,6 +26,7 @@ from __future__ import annotations
 
 import asyncio
 import io
+import itertools
 import logging
 import math
 import os
@@ -32,7 +34,7 @@ import sys
 import time
 import zipfile
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from urllib.parse import quote
 
 import httpx
@@ -90,6 +92,7 @@ GEONAMES_DATASET = os.getenv("GEONAMES_DATASET", "cities15000").strip()
 MAX_RADIUS_KM = float(os.getenv("MAX_RADIUS_KM", "30"))
 WIKIDATA_MAX_QPS = float(os.getenv("WIKIDATA_MAX_QPS", "2"))
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "2000"))
+FETCH_ITERSIZE = int(os.getenv("FETCH_ITERSIZE", "10000"))
 ONLY_NULL = os.getenv("ONLY_NULL", "1").strip() != "0"
 
 # Constants
@@ -101,6 +104,21 @@ EXACT_MATCH_THRESHOLD = 100  # Exact name match
 FUZZY_MATCH_THRESHOLD = 94   # Fuzzy match minimum score
 WIKIDATA_MATCH_THRESHOLD = 92
 
+# SPARQL query template, filled once per city with %-formatting
+SPARQL_TEMPLATE = """
+SELECT ?item ?itemLabel ?pop ?coord WHERE {
+  SERVICE wikibase:around {
+    ?item wdt:P625 ?coord .
+    bd:serviceParam wikibase:center "Point(%(lon)s %(lat)s)"^^geo:wktLiteral .
+    bd:serviceParam wikibase:radius "%(radius)s" .
+  }
+  ?item wdt:P17 ?country .
+  ?country wdt:P297 "%(country_code)s" .
+  ?item wdt:P1082 ?pop .
+  SERVICE wikibase:label { bd:serviceParam wikibase:language "en,fr". }
+}
+"""
+
 
 @dataclass
 class CityRecord:
@@ -392,8 +410,8 @@ class GeoNamesProvider:
 
         for record in candidates:
             score = max(
-                fuzz.ratio(normalized_query, record.name_normalized),
-                fuzz.ratio(normalized_query, record.ascii_normalized)
+                fuzz.ratio(normalized_query, record.name_normalized, score_cutoff=FUZZY_MATCH_THRESHOLD),
+                fuzz.ratio(normalized_query, record.ascii_normalized, score_cutoff=FUZZY_MATCH_THRESHOLD)
             )
 
             if score < FUZZY_MATCH_THRESHOLD:
@@ -458,19 +476,12 @@ class WikidataProvider:
         # Limit radius to reasonable value
         radius_km = min(radius_km, 50)
 
-        return f"""
-SELECT ?item ?itemLabel ?pop ?coord WHERE {{
-  SERVICE wikibase:around {{
-    ?item wdt:P625 ?coord .
-    bd:serviceParam wikibase:center "Point({city.lon} {city.lat})"^^geo:wktLiteral .
-    bd:serviceParam wikibase:radius "{radius_km}" .
-  }}
-  ?item wdt:P17 ?country .
-  ?country wdt:P297 "{city.country_code}" .
-  ?item wdt:P1082 ?pop .
-  SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en,fr". }}
-}}
-"""
+        return SPARQL_TEMPLATE % {
+            "lon": city.lon,
+            "lat": city.lat,
+            "radius": radius_km,
+            "country_code": city.country_code,
+        }
 
     def _parse_result(self, city: CityRecord, bindings: List[Dict[str, Any]]) -> Optional[int]:
         """Parse Wikidata results and find best match."""
@@ -594,12 +605,15 @@ class DatabaseManager:
             self.conn.close()
             logger.info("Database connection closed")
 
-    def fetch_cities(self) -> List[CityRecord]:
+    def fetch_cities(self) -> Iterator[CityRecord]:
         """
-        Fetch cities from database.
+        Stream cities from database.
 
-        Returns:
-            List of city records
+        Uses a server-side (named) cursor so rows arrive in batches of
+        FETCH_ITERSIZE instead of being materialized all at once.
+
+        Yields:
+            City records
         """
         where_clause = "AND (population IS NULL OR population <= 0)" if ONLY_NULL else ""
 
@@ -616,24 +630,24 @@ class DatabaseManager:
             ORDER BY country_code, name
         """
 
+        count = 0
+
         try:
-            with self.conn.cursor() as cursor:
+            with self.conn.cursor(name="fetch_cities_cur") as cursor:
+                cursor.itersize = FETCH_ITERSIZE
                 cursor.execute(query)
-                rows = cursor.fetchall()
-
-            cities = [
-                CityRecord(
-                    id=str(row[0]),
-                    name=row[1],
-                    country_code=row[2],
-                    lat=float(row[3]),
-                    lon=float(row[4])
-                )
-                for row in rows
-            ]
 
-            logger.info(f"Fetched {len(cities):,} cities from database")
-            return cities
+                for row in cursor:
+                    count += 1
+                    yield CityRecord(
+                        id=str(row[0]),
+                        name=row[1],
+                        country_code=row[2],
+                        lat=float(row[3]),
+                        lon=float(row[4])
+                    )
+
+            logger.info(f"Fetched {count:,} cities from database")
 
         except Exception as e:
             logger.error(f"Failed to fetch cities: {e}")
@@ -708,19 +722,19 @@ def main() -> None:
     db.connect()
 
     try:
-        # Fetch cities
+        # Peek at the first city so an empty run skips the GeoNames download
         cities = db.fetch_cities()
-        stats.total_cities = len(cities)
-
-        if not cities:
+        first_city = next(cities, None)
+        if first_city is None:
             logger.info("No cities to process")
             return
+        cities = itertools.chain([first_city], cities)
 
         # Initialize GeoNames
         geonames = GeoNamesProvider(GEONAMES_DATASET)
         geonames.download_and_parse()
 
-        # Match against GeoNames
+        # Match against GeoNames while streaming cities from the database
         logger.info("Matching against GeoNames...")
         geonames_matches = []
         unmatched_cities = []
@@ -728,6 +742,7 @@ def main() -> None:
         progress_iter = tqdm(cities, desc="GeoNames matching") if HAS_TQDM else cities
 
         for city in progress_iter:
+            stats.total_cities += 1
             try:
                 population = geonames.match_city(city)
 
@@ -760,8 +775,7 @@ def main() -> None:
             logger.info(f"Matching {len(unmatched_cities):,} unmatched cities against Wikidata...")
 
             wikidata = WikidataProvider(WIKIDATA_MAX_QPS)
-            loop = asyncio.get_event_loop()
-            wikidata_matches = loop.run_until_complete(wikidata.match_cities(unmatched_cities))
+            wikidata_matches = asyncio.run(wikidata.match_cities(unmatched_cities))
 
             stats.wikidata_matches = len(wikidata_matches)
             stats.no_match = len(unmatched_cities) - len(wikidata_matches)
@@ -1,8 +1,46 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from src.models import Country, City
 
+# HTTP defaults shared by all scrapers
+USER_AGENT = "Travliaq-Country-Scrapper/1.0"
+CONNECT_TIMEOUT = 5
+
+_shared_session: Optional[requests.Session] = None
+
+
+def create_session(pool_connections: int = 10, pool_maxsize: int = 50) -> requests.Session:
+    """Create a pooled requests session that retries throttled/failed calls."""
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "HEAD"]
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retries)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """Return the process-wide session reused by all scrapers (keep-alive)."""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = create_session()
+    return _shared_session
+
+
 class BaseScraper(ABC):
+    def __init__(self, session: Optional[requests.Session] = None):
+        self.session = session or get_shared_session()
+
     @abstractmethod
     def fetch_countries(self) -> List[Country]:
         """Fetch and return a list of Country objects."""
@@ -7,30 +7,44 @@ and updates the countries collection in MongoDB.
 Budget range includes min and max values for mid-range travelers.
 Uses LLM for missing data and outlier correction.
 """
-import csv
 import asyncio
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
+from src.config import settings
 from src.scrapers.base import BaseScraper
 from src.models import Country, City
-from src.utils.cost_parser import parse_usd_value, parse_numbeo_index
+from src.utils.cost_parser import parse_usd_series, parse_numbeo_series
 from src.utils.country_mapping import (
     get_iso2_from_name,
     get_country_name,
     get_region,
     get_neighbors,
-    COUNTRY_NAME_TO_ISO2
+    COUNTRY_NAME_TO_ISO2,
+    NORMALIZED_NAME_TO_ISO2
 )
 from src.utils.llm_estimator import (
     is_outlier,
     batch_estimate_budgets,
     MIN_REASONABLE_BUDGET,
-    MAX_REASONABLE_BUDGET
+    MAX_REASONABLE_BUDGET,
+    MAX_OUTPUT_TOKENS,
+    REQUEST_TIMEOUT,
+    MAX_RETRIES
 )
 
+# Try to import numba for the JIT-compiled budget kernel, fallback gracefully
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 logger = logging.getLogger(__name__)
 
 # Budget weights for mid-range traveler
@@ -41,6 +55,23 @@ WEIGHTS = {
     'activities': 0.15,
 }
 
+# BudgetYourTrip cost columns, aligned with WEIGHT_VECTOR
+COST_COLUMNS = [
+    'budgetyourtrip_hotel_cost',
+    'budgetyourtrip_meals_cost',
+    'budgetyourtrip_transport_cost',
+    'budgetyourtrip_activities_cost',
+]
+WEIGHT_VECTOR = np.array([
+    WEIGHTS['hotel'],
+    WEIGHTS['meals'],
+    WEIGHTS['transport'],
+    WEIGHTS['activities'],
+])
+
+# Below this many rows the JIT compile cost outweighs the kernel speedup
+NUMBA_MIN_ROWS = 10_000
+
 # Range factor for creating min/max from single value
 RANGE_FACTOR_LOW = 0.85   # min = value * 0.85
 RANGE_FACTOR_HIGH = 1.15  # max = value * 1.15
@@ -53,6 +84,56 @@ NYC_COST_INDEX = 100.0        # NYC's Numbeo cost of living index baseline
 DEFAULT_CSV_PATH = Path(__file__).parent.parent.parent / "data" / "cost_of_living_2025.csv"
 
 
+def _batched(items: List[Tuple[str, Tuple[float, float]]], size: int) -> Iterator[Dict[str, Tuple[float, float]]]:
+    """Split (iso2, budget) pairs into dicts of at most size entries."""
+    for i in range(0, len(items), size):
+        yield dict(items[i:i + size])
+
+
+def _weighted_budgets_numpy(costs: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Weighted budget per row, redistributing weight over available costs.
+
+    Args:
+        costs: (N, K) array of costs, NaN if missing
+        weights: (K,) category weights
+
+    Returns:
+        (N,) array of budgets, NaN for rows without any cost
+    """
+    available_weights = np.where(np.isnan(costs), 0.0, weights)
+    weight_sums = available_weights.sum(axis=1, keepdims=True)
+
+    # Calculate budget with normalized weights
+    with np.errstate(divide='ignore', invalid='ignore'):
+        budgets = np.nansum(costs * (available_weights / weight_sums), axis=1)
+    return np.where(weight_sums[:, 0] > 0, budgets, np.nan)
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _weighted_budgets_numba(costs: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """JIT-compiled equivalent of _weighted_budgets_numpy."""
+        budgets = np.empty(costs.shape[0])
+
+        for i in prange(costs.shape[0]):
+            weight_sum = 0.0
+            for j in range(costs.shape[1]):
+                if not np.isnan(costs[i, j]):
+                    weight_sum += weights[j]
+
+            if weight_sum > 0:
+                budget = 0.0
+                for j in range(costs.shape[1]):
+                    if not np.isnan(costs[i, j]):
+                        budget += costs[i, j] * (weights[j] / weight_sum)
+                budgets[i] = budget
+            else:
+                budgets[i] = np.nan
+
+        return budgets
+
+
 class BudgetCalculatorScraper(BaseScraper):
     """
     Scraper that calculates daily travel budget ranges from cost of living data.
@@ -70,6 +151,7 @@ class BudgetCalculatorScraper(BaseScraper):
         Args:
             csv_path: Path to cost of living CSV file
         """
+        super().__init__()
         self.csv_path = csv_path
         self.budget_data: Dict[str, Tuple[float, float]] = {}  # iso2 -> (min, max)
         self.raw_csv_data: Dict[str, Dict] = {}  # iso2 -> raw row data
@@ -89,20 +171,43 @@ class BudgetCalculatorScraper(BaseScraper):
         Returns:
             Dictionary mapping ISO2 codes to (min, max) budget tuples
         """
+        for _ in self.iter_budget_batches():
+            pass
+        return self.budget_data
+
+    def iter_budget_batches(self, batch_size: int = 500) -> Iterator[Dict[str, Tuple[float, float]]]:
+        """
+        Calculate budgets, yielding them in batches as soon as each phase settles.
+
+        CSV-derived budgets are yielded before the LLM phase starts, so callers
+        can persist them while missing/outlier countries are still being estimated.
+
+        Args:
+            batch_size: Maximum number of countries per yielded batch
+
+        Yields:
+            Dictionaries mapping ISO2 codes to (min, max) budget tuples
+        """
         logger.info(f"Reading cost of living data from: {self.csv_path}")
 
         if not self.csv_path.exists():
             logger.error(f"CSV file not found: {self.csv_path}")
-            return {}
+            return
 
         # Phase 1: Parse CSV and calculate budgets from data
         self._parse_csv()
+        from_csv = list(self.budget_data.items())
+        yield from _batched(from_csv, batch_size)
 
         # Phase 2: Run LLM for missing/outlier values
         asyncio.run(self._fill_missing_with_llm())
+        known = {iso2 for iso2, _ in from_csv}
+        yield from _batched(
+            [(iso2, budget) for iso2, budget in self.budget_data.items() if iso2 not in known],
+            batch_size
+        )
 
         logger.info(f"Final budget count: {len(self.budget_data)} countries")
-        return self.budget_data
 
     def _parse_csv(self):
         """Parse CSV and calculate initial budgets."""
@@ -110,53 +215,66 @@ class BudgetCalculatorScraper(BaseScraper):
         calculated = 0
         needs_llm = []
 
-        with open(self.csv_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-
-            for row in reader:
-                country_name = row.get('country', '').strip()
-                if not country_name:
-                    continue
-
-                # Get ISO2 code
-                iso2 = get_iso2_from_name(country_name)
-                if not iso2:
-                    skipped.append(country_name)
-                    continue
-
-                # Store raw data for LLM context
-                self.raw_csv_data[iso2] = row
-
-                # Calculate budget
-                budget_range = self._calculate_row_budget(row)
-
-                if budget_range is not None:
-                    min_budget, max_budget = budget_range
-
-                    # Check for outliers
-                    avg_budget = (min_budget + max_budget) / 2
-                    if is_outlier(avg_budget):
-                        logger.warning(f"{country_name} ({iso2}): outlier ${avg_budget:.0f}/day - will use LLM")
-                        needs_llm.append({
-                            "iso2": iso2,
-                            "name": country_name,
-                            "region": get_region(iso2),
-                            "current_value": avg_budget,
-                            "numbeo_index": parse_numbeo_index(row.get('numbeo_cost_of_living_index'))
-                        })
-                    else:
-                        self.budget_data[iso2] = budget_range
-                        calculated += 1
-                        logger.debug(f"{country_name} ({iso2}): ${min_budget:.0f}-${max_budget:.0f}/day")
-                else:
-                    # No data at all - need LLM
+        df = pd.read_csv(self.csv_path, dtype=str, na_filter=False, engine='c', encoding='utf-8')
+        df['country'] = df['country'].str.strip()
+        df = df[df['country'] != '']
+
+        # Compute every row's budget in one vectorized pass
+        costs = df[COST_COLUMNS].apply(parse_usd_series).to_numpy(dtype=np.float64)
+        numbeo_indexes = parse_numbeo_series(df['numbeo_cost_of_living_index']).to_numpy(dtype=np.float64)
+        budgets = self._calculate_budgets(costs, numbeo_indexes)
+
+        # Map names to ISO2 in one pass; only misses go through the slow path
+        iso2_codes = [
+            iso2 if isinstance(iso2, str) else get_iso2_from_name(name)
+            for name, iso2 in zip(df['country'], df['country'].str.lower().map(NORMALIZED_NAME_TO_ISO2))
+        ]
+
+        for row, iso2, budget, numbeo_index in zip(
+            df.to_dict('records'), iso2_codes, budgets, numbeo_indexes
+        ):
+            country_name = row['country']
+
+            if not iso2:
+                skipped.append(country_name)
+                continue
+
+            # Store raw data for LLM context
+            self.raw_csv_data[iso2] = row
+
+            numbeo_index = None if np.isnan(numbeo_index) else float(numbeo_index)
+
+            if not np.isnan(budget):
+                # Create range from calculated value
+                budget = round(float(budget), 2)
+                min_budget = round(budget * RANGE_FACTOR_LOW, 2)
+                max_budget = round(budget * RANGE_FACTOR_HIGH, 2)
+                budget_range = (min_budget, max_budget)
+
+                # Check for outliers
+                avg_budget = (min_budget + max_budget) / 2
+                if is_outlier(avg_budget):
+                    logger.warning(f"{country_name} ({iso2}): outlier ${avg_budget:.0f}/day - will use LLM")
                     needs_llm.append({
                         "iso2": iso2,
                         "name": country_name,
                         "region": get_region(iso2),
-                        "current_value": None,
-                        "numbeo_index": parse_numbeo_index(row.get('numbeo_cost_of_living_index'))
+                        "current_value": avg_budget,
+                        "numbeo_index": numbeo_index
                     })
+                else:
+                    self.budget_data[iso2] = budget_range
+                    calculated += 1
+                    logger.debug(f"{country_name} ({iso2}): ${min_budget:.0f}-${max_budget:.0f}/day")
+            else:
+                # No data at all - need LLM
+                needs_llm.append({
+                    "iso2": iso2,
+                    "name": country_name,
+                    "region": get_region(iso2),
+                    "current_value": None,
+                    "numbeo_index": numbeo_index
+                })
 
         if skipped:
             logger.warning(f"Skipped {len(skipped)} countries without ISO2 mapping")
@@ -177,17 +295,28 @@ class BudgetCalculatorScraper(BaseScraper):
         logger.info(f"Starting LLM estimation for {len(countries_to_estimate)} countries...")
 
         try:
+            # The whole LLM phase is bounded by a wall-clock budget; chunks
+            # finished before it runs out are kept (and cached)
             llm_results = await batch_estimate_budgets(
                 countries_to_estimate,
-                self.budget_data  # Pass known budgets for neighbor context
+                self.budget_data,  # Pass known budgets for neighbor context
+                max_output_tokens=MAX_OUTPUT_TOKENS,
+                request_timeout=REQUEST_TIMEOUT,
+                max_retries=MAX_RETRIES,
+                wall_timeout=settings.LLM_WALL_TIMEOUT_S
             )
 
-            # Merge results
             for iso2, budget_range in llm_results.items():
                 self.budget_data[iso2] = budget_range
 
             logger.info(f"LLM estimated {len(llm_results)} budgets")
 
+            # Countries dropped by a failed, truncated or timed-out chunk still get a budget
+            missing = sum(1 for c in countries_to_estimate if c["iso2"] not in self.budget_data)
+            if missing:
+                logger.warning(f"LLM returned no budget for {missing} countries, using regional averages")
+                self._fallback_regional_averages()
+
         except Exception as e:
             logger.error(f"LLM estimation failed: {e}")
             # Fallback: use regional averages for failed estimations
@@ -195,28 +324,25 @@ class BudgetCalculatorScraper(BaseScraper):
 
     def _fallback_regional_averages(self):
         """Fallback to regional averages if LLM fails."""
-        # Group known budgets by region
-        regional_budgets: Dict[str, List[Tuple[float, float]]] = {}
-
-        for iso2, (min_b, max_b) in self.budget_data.items():
-            region = get_region(iso2)
-            if region not in regional_budgets:
-                regional_budgets[region] = []
-            regional_budgets[region].append((min_b, max_b))
-
-        # Calculate regional averages
-        regional_averages: Dict[str, Tuple[float, float]] = {}
-        for region, budgets in regional_budgets.items():
-            avg_min = sum(b[0] for b in budgets) / len(budgets)
-            avg_max = sum(b[1] for b in budgets) / len(budgets)
-            regional_averages[region] = (round(avg_min, 2), round(avg_max, 2))
+        # Average known budgets by region in a single grouped reduction
+        known = pd.DataFrame(
+            list(self.budget_data.values()),
+            index=list(self.budget_data.keys()),
+            columns=['min', 'max'],
+            dtype=np.float64
+        )
+        known['region'] = [get_region(iso2) for iso2 in known.index]
+
+        regional_averages: Dict[str, Tuple[float, float]] = {
+            region: (round(avg['min'], 2), round(avg['max'], 2))
+            for region, avg in known.groupby('region')[['min', 'max']].mean().to_dict('index').items()
+        }
 
         # Global average as ultimate fallback
-        all_budgets = list(self.budget_data.values())
         global_avg = (
-            sum(b[0] for b in all_budgets) / len(all_budgets),
-            sum(b[1] for b in all_budgets) / len(all_budgets)
-        ) if all_budgets else (50.0, 80.0)
+            known['min'].mean(),
+            known['max'].mean()
+        ) if not known.empty else (50.0, 80.0)
 
         # Fill missing with regional averages
         for country_info in self._countries_needing_llm:
@@ -229,93 +355,29 @@ class BudgetCalculatorScraper(BaseScraper):
                     self.budget_data[iso2] = (round(global_avg[0], 2), round(global_avg[1], 2))
                 logger.info(f"Fallback for {iso2}: regional average")
 
-    def _calculate_row_budget(self, row: Dict[str, str]) -> Optional[Tuple[float, float]]:
-        """
-        Calculate daily budget range for a single CSV row.
-
-        Args:
-            row: CSV row as dictionary
-
-        Returns:
-            Tuple (min_budget, max_budget) in USD or None if insufficient data
-        """
-        # Parse BudgetYourTrip costs
-        costs = {
-            'hotel': parse_usd_value(row.get('budgetyourtrip_hotel_cost')),
-            'meals': parse_usd_value(row.get('budgetyourtrip_meals_cost')),
-            'transport': parse_usd_value(row.get('budgetyourtrip_transport_cost')),
-            'activities': parse_usd_value(row.get('budgetyourtrip_activities_cost')),
-        }
-
-        # Try weighted calculation with available data
-        budget = self._calculate_weighted_budget(costs)
-        if budget is not None:
-            # Create range from calculated value
-            min_budget = round(budget * RANGE_FACTOR_LOW, 2)
-            max_budget = round(budget * RANGE_FACTOR_HIGH, 2)
-            return (min_budget, max_budget)
-
-        # Fallback to Numbeo estimation
-        numbeo_budget = self._estimate_from_numbeo(row)
-        if numbeo_budget is not None:
-            min_budget = round(numbeo_budget * RANGE_FACTOR_LOW, 2)
-            max_budget = round(numbeo_budget * RANGE_FACTOR_HIGH, 2)
-            return (min_budget, max_budget)
-
-        return None
-
-    def _calculate_weighted_budget(self, costs: Dict[str, Optional[float]]) -> Optional[float]:
-        """
-        Calculate weighted budget from available cost components.
-
-        Redistributes weight proportionally when some categories are missing.
-
-        Args:
-            costs: Dictionary of cost category -> USD value (or None)
-
-        Returns:
-            Weighted daily budget or None if no data
-        """
-        # Filter to available costs
-        available = {k: v for k, v in costs.items() if v is not None}
-
-        if not available:
-            return None
-
-        # Calculate sum of available weights
-        available_weight_sum = sum(WEIGHTS[k] for k in available)
-
-        if available_weight_sum == 0:
-            return None
-
-        # Calculate budget with normalized weights
-        budget = 0.0
-        for category, cost in available.items():
-            normalized_weight = WEIGHTS[category] / available_weight_sum
-            budget += cost * normalized_weight
-
-        return round(budget, 2)
-
-    def _estimate_from_numbeo(self, row: Dict[str, str]) -> Optional[float]:
+    def _calculate_budgets(self, costs: np.ndarray, numbeo_indexes: np.ndarray) -> np.ndarray:
         """
-        Estimate daily budget using Numbeo cost of living index.
+        Calculate daily budgets for all CSV rows at once.
 
-        Uses NYC as baseline (index 100 = $200/day mid-range).
+        The weighted BudgetYourTrip budget redistributes weight proportionally
+        when some categories are missing; rows without any cost fall back to
+        the Numbeo estimate (NYC baseline: index 100 = $200/day mid-range).
 
         Args:
-            row: CSV row dictionary
+            costs: (N, 4) array of USD costs in COST_COLUMNS order, NaN if missing
+            numbeo_indexes: (N,) array of Numbeo indexes, NaN if missing
 
         Returns:
-            Estimated daily budget or None
+            (N,) array of unrounded daily budgets, NaN if insufficient data
         """
-        index = parse_numbeo_index(row.get('numbeo_cost_of_living_index'))
-
-        if index is None:
-            return None
-
-        # Scale relative to NYC
-        budget = (index / NYC_COST_INDEX) * NYC_REFERENCE_BUDGET
-        return round(budget, 2)
+        if HAS_NUMBA and costs.shape[0] >= NUMBA_MIN_ROWS:
+            budgets = _weighted_budgets_numba(np.ascontiguousarray(costs), WEIGHT_VECTOR)
+        else:
+            budgets = _weighted_budgets_numpy(costs, WEIGHT_VECTOR)
+
+        # Fallback to Numbeo estimation, scaled relative to NYC
+        numbeo_budgets = (numbeo_indexes / NYC_COST_INDEX) * NYC_REFERENCE_BUDGET
+        return np.where(np.isnan(budgets), numbeo_budgets, budgets)
 
     def get_budget_for_country(self, iso2: str) -> Optional[Tuple[float, float]]:
         """
@@ -1,9 +1,8 @@
-import requests
 import logging
 import gzip
-import json
-from typing import List
-from src.scrapers.base import BaseScraper
+import ijson
+from typing import Any, Dict, Iterator, List
+from src.scrapers.base import BaseScraper, CONNECT_TIMEOUT
 from src.models import Country, City
 
 logger = logging.getLogger(__name__)
@@ -19,24 +18,17 @@ class GeoDataScraper(BaseScraper):
     def fetch_cities(self) -> List[City]:
         logger.info(f"Fetching cities from {self.BASE_URL}")
         try:
-            # Download the gzipped file
-            response = requests.get(self.BASE_URL, timeout=120)
-            response.raise_for_status()
-            
-            # Decompress the gzipped content
-            decompressed_data = gzip.decompress(response.content)
-            data_str = decompressed_data.decode('utf-8')
-            
-            # Parse JSON
-            data = json.loads(data_str)
-            
             cities = []
             # Limit to major cities or process all? 
             # Let's process all but maybe filter by population if available to keep DB clean?
             # The dataset has: name, latitude, longitude, country_code, state_code
             
+            # Fields are checked/converted here, so skip Pydantic validation
+            # per object - it dominates the cost for ~150k cities.
+            construct_city = City.model_construct
+
             count = 0
-            for item in data:
+            for item in self._stream_items():
                 try:
                     # Basic validation
                     if not item.get('name') or not item.get('country_code'):
@@ -45,14 +37,17 @@ class GeoDataScraper(BaseScraper):
                     # Optional: Filter tiny villages if needed. 
                     # For now, we take everything.
                     
-                    city = City(
+                    latitude = item.get('latitude')
+                    longitude = item.get('longitude')
+
+                    city = construct_city(
                         name=item.get('name'),
                         country_code=item.get('country_code'),
                         country_name=item.get('country_name'),
                         state_code=item.get('state_code'),
                         state_name=item.get('state_name'),
-                        latitude=float(item.get('latitude')) if item.get('latitude') else None,
-                        longitude=float(item.get('longitude')) if item.get('longitude') else None,
+                        latitude=float(latitude) if latitude else None,
+                        longitude=float(longitude) if longitude else None,
                         source="dr5hn/countries-states-cities"
                     )
                     cities.append(city)
@@ -71,3 +66,12 @@ class GeoDataScraper(BaseScraper):
         except Exception as e:
             logger.error(f"Error fetching cities: {e}")
             return []
+
+    def _stream_items(self) -> Iterator[Dict[str, Any]]:
+        """Stream city items from the gzipped JSON without loading it whole."""
+        with self.session.get(self.BASE_URL, stream=True, timeout=(CONNECT_TIMEOUT, 120)) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+
+            with gzip.GzipFile(fileobj=response.raw) as gz:
+                yield from ijson.items(gz, 'item')
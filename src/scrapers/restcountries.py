@@ -1,6 +1,6 @@
-import requests
+import orjson
 from typing import List
-from src.scrapers.base import BaseScraper
+from src.scrapers.base import BaseScraper, CONNECT_TIMEOUT
 from src.models import Country, City
 import logging
 
@@ -13,12 +13,9 @@ class RestCountriesScraper(BaseScraper):
     def fetch_countries(self) -> List[Country]:
         logger.info(f"Fetching countries from {self.BASE_URL}")
         try:
-            headers = {
-                "User-Agent": "Travliaq-Country-Scrapper/1.0"
-            }
-            response = requests.get(self.BASE_URL, headers=headers, timeout=30)
+            response = self.session.get(self.BASE_URL, timeout=(CONNECT_TIMEOUT, 30))
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             countries = []
             for item in data:
@@ -8,13 +8,55 @@ their guidelines and proper attribution.
 API Key: Get yours at https://unsplash.com/developers
 """
 
+import asyncio
+import hashlib
+import json
 import requests
+import httpx
+import orjson
 import logging
-from typing import Optional, Dict
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from src.config import settings
+from src.scrapers.base import CONNECT_TIMEOUT, create_session
 
 logger = logging.getLogger(__name__)
 
+# Async fan-out limits (Unsplash demo apps are capped at 50 requests/hour)
+MAX_CONCURRENT_REQUESTS = 5
+MAX_CONNECTIONS = 10
+REQUEST_TIMEOUT = 10
+
+# On-disk cache of search results, so re-runs do not spend API quota again
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / ".cache" / "unsplash"
+CACHE_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+
+# Stop querying when fewer requests than this remain in the hourly quota
+RATE_LIMIT_RESERVE = 5
+
+
+class RateLimitReserveError(requests.exceptions.HTTPError):
+    """Hourly quota fell below RATE_LIMIT_RESERVE; reported like a 403 so callers back off."""
+
+    def __init__(self, remaining: int):
+        super().__init__(f"403 Forbidden: Unsplash rate limit reserve reached ({remaining} requests left)")
+        self.remaining = remaining
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    """403 from Unsplash or the hourly quota reserve reached: callers must back off."""
+    if isinstance(exc, RateLimitReserveError):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 403
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry only on throttling / temporary unavailability."""
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in (429, 503)
+
 
 class UnsplashPhotoScraper:
     """
@@ -26,14 +68,41 @@ class UnsplashPhotoScraper:
 
     BASE_URL = "https://api.unsplash.com"
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR):
         """
         Initialize Unsplash scraper.
 
         Args:
             api_key: Unsplash API access key (gets from settings if not provided)
+            cache_dir: Directory for cached search results (None disables caching)
         """
         self.api_key = api_key or getattr(settings, 'UNSPLASH_API_KEY', None)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+        # Static request parts, built once
+        self._headers = {
+            "Authorization": f"Client-ID {self.api_key}",
+            "Accept-Version": "v1"
+        }
+        self._base_params = {
+            "per_page": 2,  # Get 2 photos for comparison
+            "orientation": "landscape",  # Better for country representations
+            "content_filter": "high",     # Family-friendly content only
+            "order_by": "relevant"
+        }
+
+        # Dedicated pooled session: the Authorization header must not leak
+        # to the other scrapers' shared session
+        self.session = create_session()
+        self.session.headers.update(self._headers)
+
+        # Bounds concurrent requests when called from several threads
+        self._request_slots = threading.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        # Per-country results for the lifetime of this instance,
+        # keyed by (country name, fallback queries)
+        self._country_results: Dict[Tuple[str, Tuple[str, ...]], Optional[list[Dict[str, str]]]] = {}
+
         if not self.api_key:
             logger.warning("No Unsplash API key provided. Photo enrichment will be skipped.")
 
@@ -47,10 +116,65 @@ class UnsplashPhotoScraper:
 
         Returns:
             List of dictionaries with photo_url, credit, source, and index, or None if not found
+
+        Raises:
+            requests.exceptions.HTTPError: 403 from Unsplash, or the hourly
+                quota dropped below RATE_LIMIT_RESERVE
         """
         if not self.api_key:
             return None
 
+        memo_key = (country_name, tuple(fallback_queries or ()))
+        if memo_key in self._country_results:
+            return self._country_results[memo_key]
+
+        queries = self._build_queries(country_name, fallback_queries)
+        generic_count = len(queries) - len(fallback_queries or [])
+        skip_generic = False
+        had_errors = False
+
+        for idx, query in enumerate(queries):
+            if skip_generic and idx < generic_count:
+                continue
+
+            try:
+                photos, total, remaining = self._search_photo_with_meta(query)
+            except requests.exceptions.HTTPError:
+                # Rate limited (403): stop the chain and let the caller back off
+                raise
+            except Exception as e:
+                logger.debug(f"Query '{query}' failed for {country_name}: {e}")
+                had_errors = True
+                continue
+
+            if photos is None and total is None:
+                # Request or parse error (already logged), not an empty result
+                had_errors = True
+                continue
+
+            if photos:
+                logger.info(f"Found {len(photos)} photo(s) for {country_name} using query: {query}")
+                self._country_results[memo_key] = photos
+                return photos
+
+            if remaining is not None and remaining < RATE_LIMIT_RESERVE:
+                # Reported like a 403 so callers back off instead of counting a miss
+                logger.warning(f"Only {remaining} Unsplash requests left this hour, stopping at {country_name}")
+                raise RateLimitReserveError(remaining)
+
+            if idx == 0 and total == 0:
+                # Nothing at all for the country name: the other generic
+                # "<country> ..." queries would come back empty too
+                skip_generic = True
+
+        logger.warning(f"No photo found for {country_name} after trying all queries")
+        if not had_errors:
+            # Only a definitive miss is remembered; transient failures are retried next call
+            self._country_results[memo_key] = None
+        return None
+
+    def _build_queries(self, country_name: str, fallback_queries: list[str] = None) -> list[str]:
+        """Build the ordered list of search queries for a country."""
         # Primary search query: country name + landmark/landscape keywords
         queries = [
             f"{country_name} landmark",
@@ -63,18 +187,7 @@ class UnsplashPhotoScraper:
         if fallback_queries:
             queries.extend(fallback_queries)
 
-        for query in queries:
-            try:
-                photos = self._search_photo(query)
-                if photos:
-                    logger.info(f"Found {len(photos)} photo(s) for {country_name} using query: {query}")
-                    return photos
-            except Exception as e:
-                logger.debug(f"Query '{query}' failed for {country_name}: {e}")
-                continue
-
-        logger.warning(f"No photo found for {country_name} after trying all queries")
-        return None
+        return queries
 
     def _search_photo(self, query: str) -> Optional[Dict[str, str]]:
         """
@@ -86,65 +199,289 @@ class UnsplashPhotoScraper:
         Returns:
             Dictionary with photo data or None
         """
-        headers = {
-            "Authorization": f"Client-ID {self.api_key}",
-            "Accept-Version": "v1"
-        }
+        return self._search_photo_with_meta(query)[0]
 
-        params = {
-            "query": query,
-            "per_page": 2,  # Get 2 photos for comparison
-            "orientation": "landscape",  # Better for country representations
-            "content_filter": "high",     # Family-friendly content only
-            "order_by": "relevant"
-        }
+    def _search_photo_with_meta(self, query: str) -> Tuple[Optional[list[Dict[str, str]]], Optional[int], Optional[int]]:
+        """
+        Search for a photo and report the signals needed to stop early.
+
+        Args:
+            query: Search query string
+
+        Returns:
+            Tuple (photos or None, total results, remaining hourly quota);
+            total and remaining are None when unknown
+        """
+        cached = self._cache_get(query)
+        if cached is not None:
+            return cached, len(cached), None
 
         try:
-            response = requests.get(
-                f"{self.BASE_URL}/search/photos",
-                headers=headers,
-                params=params,
-                timeout=10
-            )
+            with self._request_slots:
+                response = self.session.get(
+                    f"{self.BASE_URL}/search/photos",
+                    params={**self._base_params, "query": query},
+                    timeout=(CONNECT_TIMEOUT, REQUEST_TIMEOUT)
+                )
             response.raise_for_status()
 
-            data = response.json()
+            remaining = response.headers.get("X-Ratelimit-Remaining")
+            remaining = int(remaining) if remaining and remaining.isdigit() else None
+
+            data = orjson.loads(response.content)
+            photos = self._parse_search_results(data)
+            self._cache_set(query, photos)
+            return photos, data.get("total"), remaining
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Unsplash API request failed for query '{query}': {e}")
+            # Re-raise 403 errors so they can be caught and handled for rate limiting
+            if "403" in str(e) or "Forbidden" in str(e):
+                raise
+            return None, None, None
+        except (KeyError, IndexError, orjson.JSONDecodeError) as e:
+            logger.error(f"Failed to parse Unsplash response for query '{query}': {e}")
+            return None, None, None
+
+    def _parse_search_results(self, data: Dict) -> Optional[list[Dict[str, str]]]:
+        """
+        Extract up to 2 photos with attribution from a search response.
+
+        Args:
+            data: Decoded JSON body of /search/photos
+
+        Returns:
+            List of photo dictionaries or None
+        """
+        if not (data.get("total") > 0 and data.get("results")):
+            return None
 
-            if data.get("total") > 0 and data.get("results"):
-                results = data["results"]
-                photos = []
+        photos = []
+
+        # Get up to 2 photos
+        for idx, photo in enumerate(data["results"][:2], 1):
+            # Extract high-quality URL (regular size - good balance of quality/size)
+            photo_url = photo["urls"]["regular"]
+
+            # Build proper attribution per Unsplash guidelines
+            photographer = photo["user"]["name"]
+            photographer_username = photo["user"]["username"]
+            credit = f"Photo by {photographer} on Unsplash"
+
+            photos.append({
+                "photo_url": photo_url,
+                "photo_credit": credit,
+                "photo_source": f"https://unsplash.com/@{photographer_username}",
+                "index": idx
+            })
+
+        return photos if photos else None
+
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(min=1, max=10),
+        reraise=True
+    )
+    async def _search_photo_async(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        query: str
+    ) -> Tuple[Optional[list[Dict[str, str]]], Optional[int], Optional[int]]:
+        """
+        Async variant of _search_photo_with_meta, bounded by a shared semaphore.
 
-                # Get up to 2 photos
-                for idx, photo in enumerate(results[:2], 1):
-                    # Extract high-quality URL (regular size - good balance of quality/size)
-                    photo_url = photo["urls"]["regular"]
+        Retries 429/503 responses with exponential backoff; 403 and other
+        HTTP errors, as well as unparseable responses, are raised to the caller.
+
+        Args:
+            client: Shared httpx async client
+            semaphore: Concurrency limiter shared across all searches
+            query: Search query string
+
+        Returns:
+            Tuple (photos or None, total results, remaining hourly quota);
+            remaining is None when unknown
+        """
+        cached = self._cache_get(query)
+        if cached is not None:
+            return cached, len(cached), None
+
+        async with semaphore:
+            response = await client.get(
+                f"{self.BASE_URL}/search/photos",
+                headers=self._headers,
+                params={**self._base_params, "query": query}
+            )
+        response.raise_for_status()
 
-                    # Build proper attribution per Unsplash guidelines
-                    photographer = photo["user"]["name"]
-                    photographer_username = photo["user"]["username"]
-                    credit = f"Photo by {photographer} on Unsplash"
+        remaining = response.headers.get("X-Ratelimit-Remaining")
+        remaining = int(remaining) if remaining and remaining.isdigit() else None
 
-                    photos.append({
-                        "photo_url": photo_url,
-                        "photo_credit": credit,
-                        "photo_source": f"https://unsplash.com/@{photographer_username}",
-                        "index": idx
-                    })
+        data = orjson.loads(response.content)
+        photos = self._parse_search_results(data)
+        self._cache_set(query, photos)
+        return photos, data.get("total"), remaining
 
-                return photos if photos else None
+    def _cache_path(self, query: str) -> Path:
+        """Cache file for a query (keyed by SHA-1 of the query string)."""
+        return self.cache_dir / f"{hashlib.sha1(query.encode('utf-8')).hexdigest()}.json"
 
+    def _cache_get(self, query: str) -> Optional[list[Dict[str, str]]]:
+        """Return cached photos for a query, or None if missing/expired."""
+        if not self.cache_dir:
             return None
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Unsplash API request failed for query '{query}': {e}")
-            # Re-raise 403 errors so they can be caught and handled for rate limiting
-            if "403" in str(e) or "Forbidden" in str(e):
-                raise
+        try:
+            with open(self._cache_path(query), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
             return None
-        except (KeyError, IndexError) as e:
-            logger.error(f"Failed to parse Unsplash response for query '{query}': {e}")
+
+        if time.time() - entry.get("cached_at", 0) > CACHE_TTL_SECONDS:
             return None
 
+        return entry.get("photos")
+
+    def _cache_set(self, query: str, photos: Optional[list[Dict[str, str]]]) -> None:
+        """Store photos for a query (empty results are not cached)."""
+        if not self.cache_dir or not photos:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_path(query), 'w', encoding='utf-8') as f:
+                json.dump({"cached_at": time.time(), "query": query, "photos": photos}, f)
+        except OSError as e:
+            logger.debug(f"Could not cache Unsplash result for '{query}': {e}")
+
+    async def get_country_photo_async(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        country_name: str,
+        fallback_queries: list[str] = None
+    ) -> Optional[list[Dict[str, str]]]:
+        """
+        Async variant of get_country_photo.
+
+        Queries for one country run one at a time in priority order and stop
+        at the first hit (as in the sync path), so only the countries run
+        concurrently; results are shared with get_country_photo through
+        _country_results.
+
+        Args:
+            client: Shared httpx async client
+            semaphore: Concurrency limiter shared across all searches
+            country_name: Name of the country
+            fallback_queries: Alternative search terms
+
+        Returns:
+            List of photo dictionaries or None if not found
+
+        Raises:
+            httpx.HTTPStatusError: 403 from Unsplash
+            RateLimitReserveError: The hourly quota dropped below RATE_LIMIT_RESERVE
+        """
+        if not self.api_key:
+            return None
+
+        memo_key = (country_name, tuple(fallback_queries or ()))
+        if memo_key in self._country_results:
+            return self._country_results[memo_key]
+
+        queries = self._build_queries(country_name, fallback_queries)
+        generic_count = len(queries) - len(fallback_queries or [])
+        skip_generic = False
+        had_errors = False
+
+        for idx, query in enumerate(queries):
+            if skip_generic and idx < generic_count:
+                continue
+
+            try:
+                photos, total, remaining = await self._search_photo_async(client, semaphore, query)
+            except httpx.HTTPStatusError as e:
+                # Rate limited (403): stop the chain and let the caller back off
+                if e.response.status_code == 403:
+                    raise
+                logger.debug(f"Query '{query}' failed for {country_name}: {e}")
+                had_errors = True
+                continue
+            except (httpx.HTTPError, KeyError, IndexError, orjson.JSONDecodeError) as e:
+                logger.debug(f"Query '{query}' failed for {country_name}: {e}")
+                had_errors = True
+                continue
+
+            if photos:
+                logger.info(f"Found {len(photos)} photo(s) for {country_name} using query: {query}")
+                self._country_results[memo_key] = photos
+                return photos
+
+            if remaining is not None and remaining < RATE_LIMIT_RESERVE:
+                logger.warning(f"Only {remaining} Unsplash requests left this hour, stopping at {country_name}")
+                raise RateLimitReserveError(remaining)
+
+            if idx == 0 and total == 0:
+                # Nothing at all for the country name: the other generic
+                # "<country> ..." queries would come back empty too
+                skip_generic = True
+
+        logger.warning(f"No photo found for {country_name} after trying all queries")
+        if not had_errors:
+            # Only a definitive miss is remembered; transient failures are retried next call
+            self._country_results[memo_key] = None
+        return None
+
+    async def fetch_country_photos(self, country_names: List[str]) -> Dict[str, Optional[list[Dict[str, str]]]]:
+        """
+        Fetch photos for many countries concurrently.
+
+        Curated COUNTRY_SPECIFIC_QUERIES are used as fallbacks. Countries found
+        before a rate limit stay in _country_results, so calling again after
+        backing off only queries the remaining ones.
+
+        Args:
+            country_names: Country names to look up
+
+        Returns:
+            Dictionary mapping country name to its photos (or None)
+
+        Raises:
+            httpx.HTTPStatusError: 403 from Unsplash (other countries are cancelled)
+            RateLimitReserveError: The hourly quota dropped below RATE_LIMIT_RESERVE
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        limits = httpx.Limits(max_connections=MAX_CONNECTIONS)
+
+        async def fetch_one(client: httpx.AsyncClient, name: str) -> Optional[list[Dict[str, str]]]:
+            try:
+                return await self.get_country_photo_async(
+                    client,
+                    semaphore,
+                    name,
+                    fallback_queries=COUNTRY_SPECIFIC_QUERIES.get(name)
+                )
+            except Exception as e:
+                if _is_rate_limited(e):
+                    raise
+                logger.error(f"Unsplash lookup failed for {name}: {e}")
+                return None
+
+        async with httpx.AsyncClient(limits=limits, timeout=REQUEST_TIMEOUT) as client:
+            tasks = [asyncio.ensure_future(fetch_one(client, name)) for name in country_names]
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                # Rate limited: stop spending quota on the other countries
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        return dict(zip(country_names, results))
+
 
 # Curated fallback queries for countries with specific landmarks
 COUNTRY_SPECIFIC_QUERIES = {
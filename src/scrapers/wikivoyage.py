@@ -1,19 +1,53 @@
+import asyncio
 import requests
+import httpx
+import orjson
 import logging
 from typing import List, Optional, Dict, Any
-from src.scrapers.base import BaseScraper
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+from src.scrapers.base import BaseScraper, CONNECT_TIMEOUT, USER_AGENT
 from src.models import Country, City
 from src.database import Database
 
 logger = logging.getLogger(__name__)
 
+# MediaWiki returns at most 20 intro extracts per request
+MAX_TITLES_PER_REQUEST = 20
+
+# Courtesy limits for concurrent Wikimedia API calls
+MAX_CONCURRENT_REQUESTS = 4
+REQUEST_TIMEOUT = 10
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry only on network errors, throttling and server errors."""
+    if isinstance(exc, httpx.TransportError):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and (
+        exc.response.status_code == 429 or exc.response.status_code >= 500
+    )
+
+
 class WikivoyageScraper(BaseScraper):
     # Wikivoyage API endpoint
     BASE_URL = "https://en.wikivoyage.org/w/api.php"
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, session: Optional[requests.Session] = None):
+        super().__init__(session)
         self.db = db
 
+        # Static part of the extracts query, built once
+        self._base_params = {
+            "action": "query",
+            "format": "json",
+            "formatversion": 2,  # pages as a list, no page-id keys
+            "prop": "extracts",
+            "exintro": 1,
+            "explaintext": 1,
+            "exlimit": "max",
+            "redirects": 1
+        }
+
     def fetch_countries(self) -> List[Country]:
         return []
 
@@ -37,67 +71,139 @@ class WikivoyageScraper(BaseScraper):
             "Singapore", "Barcelona", "Rome", "Bangkok", "Istanbul"
         ]
         
+        # Fetch summaries in as few API calls as possible
+        batches = [
+            target_cities[i:i + MAX_TITLES_PER_REQUEST]
+            for i in range(0, len(target_cities), MAX_TITLES_PER_REQUEST)
+        ]
+
+        summaries: Dict[str, str] = {}
+        if len(batches) == 1:
+            try:
+                summaries = self._get_city_summaries_batch(batches[0])
+            except Exception as e:
+                logger.warning(f"Failed to fetch Wikivoyage summaries for {batches[0]}: {e}")
+        elif batches:
+            # Several batches: issue them concurrently
+            summaries = asyncio.run(self._fetch_batches(batches))
+
+        # We need country_code to match the unique index (name, country_code),
+        # so look the cities up in our DB - in a single query.
+        db_cities: Dict[str, Dict[str, Any]] = {}
+        if summaries:
+            for db_city in self.db.cities.find({"name": {"$in": list(summaries)}}):
+                db_cities.setdefault(db_city['name'], db_city)
+
         enriched_cities = []
-        
+
         for city_name in target_cities:
             try:
-                summary = self._get_city_summary(city_name)
-                if summary:
-                    # Create a partial City object for update
-                    # We need country_code to match the unique index (name, country_code)
-                    # Ideally we should query the DB to get the correct country_code for "Paris" etc.
-                    # But here we are mocking the "selection" logic.
-                    # Let's assume we found them. 
-                    
-                    # REAL IMPLEMENTATION:
-                    # db_city = self.db.cities.find_one({"name": city_name})
-                    # if db_city: ...
-                    
-                    # For MVP simplicity without querying DB inside scraper (keeping it pure-ish):
-                    # We will just return what we found and let the Upsert handle it IF we have the keys.
-                    # Without country_code, we can't upsert correctly into our schema.
-                    
-                    # So, let's change strategy:
-                    # The Synchronizer should probably pass the context or we query DB here.
-                    # Since we have self.db, let's use it.
-                    
-                    db_city = self.db.cities.find_one({"name": city_name})
-                    if db_city:
-                        city = City(
-                            name=db_city['name'],
-                            country_code=db_city['country_code'],
-                            source="wikivoyage",
-                            travel_info={
-                                "summary": summary,
-                                "source": "Wikivoyage"
-                            }
-                        )
-                        enriched_cities.append(city)
-                        logger.info(f"Enriched {city_name}")
+                summary = summaries.get(city_name)
+                db_city = db_cities.get(city_name)
+                if summary and db_city:
+                    city = City(
+                        name=db_city['name'],
+                        country_code=db_city['country_code'],
+                        source="wikivoyage",
+                        travel_info={
+                            "summary": summary,
+                            "source": "Wikivoyage"
+                        }
+                    )
+                    enriched_cities.append(city)
+                    logger.info(f"Enriched {city_name}")
             except Exception as e:
                 logger.warning(f"Failed to enrich {city_name}: {e}")
                 
         return enriched_cities
 
-    def _get_city_summary(self, city_name: str) -> Optional[str]:
-        params = {
-            "action": "query",
-            "format": "json",
-            "prop": "extracts",
-            "titles": city_name,
-            "exintro": 1,
-            "explaintext": 1,
-            "redirects": 1
+    def _get_city_summaries_batch(self, city_names: List[str]) -> Dict[str, str]:
+        """
+        Fetch intro extracts for several cities with one multi-title query.
+
+        Args:
+            city_names: Up to MAX_TITLES_PER_REQUEST page titles
+
+        Returns:
+            Dictionary mapping each requested name to its extract
+        """
+        response = self.session.get(
+            self.BASE_URL,
+            params={**self._base_params, "titles": "|".join(city_names)},
+            timeout=(CONNECT_TIMEOUT, REQUEST_TIMEOUT)
+        )
+        response.raise_for_status()
+        return self._parse_summaries(city_names, orjson.loads(response.content))
+
+    async def _fetch_batches(self, batches: List[List[str]]) -> Dict[str, str]:
+        """
+        Fetch several title batches concurrently.
+
+        Args:
+            batches: Lists of page titles, one API call each
+
+        Returns:
+            Dictionary mapping requested names to extracts for all batches
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        # Wikimedia API policy requires a descriptive User-Agent (same as the sync session)
+        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT, headers={"User-Agent": USER_AGENT}) as client:
+            results = await asyncio.gather(
+                *[self._fetch_batch_async(client, semaphore, batch) for batch in batches],
+                return_exceptions=True
+            )
+
+        summaries: Dict[str, str] = {}
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to fetch Wikivoyage summaries for {batch}: {result}")
+                continue
+            summaries.update(result)
+
+        return summaries
+
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(min=1, max=10),
+        reraise=True
+    )
+    async def _fetch_batch_async(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        city_names: List[str]
+    ) -> Dict[str, str]:
+        """Async variant of _get_city_summaries_batch, bounded by a shared semaphore."""
+        async with semaphore:
+            response = await client.get(
+                self.BASE_URL,
+                params={**self._base_params, "titles": "|".join(city_names)}
+            )
+        response.raise_for_status()
+        return self._parse_summaries(city_names, orjson.loads(response.content))
+
+    def _parse_summaries(self, city_names: List[str], data: Dict[str, Any]) -> Dict[str, str]:
+        """Map requested names to extracts from an extracts query response."""
+        query = data.get("query", {})
+
+        # Extracts keyed by canonical page title (missing pages have no extract)
+        extracts = {
+            page["title"]: page["extract"]
+            for page in query.get("pages", [])
+            if page.get("extract")
         }
-        
-        try:
-            response = requests.get(self.BASE_URL, params=params, timeout=10)
-            data = response.json()
-            
-            pages = data.get("query", {}).get("pages", {})
-            for page_id, page_data in pages.items():
-                if page_id != "-1":
-                    return page_data.get("extract")
-        except Exception:
-            pass
-        return None
+
+        # Map requested names -> normalized titles -> redirect targets
+        normalized = {item["from"]: item["to"] for item in query.get("normalized", [])}
+        redirects = {item["from"]: item["to"] for item in query.get("redirects", [])}
+
+        summaries = {}
+        for name in city_names:
+            title = normalized.get(name, name)
+            title = redirects.get(title, title)
+            if title in extracts:
+                summaries[name] = extracts[title]
+
+        return summaries
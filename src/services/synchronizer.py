@@ -1,72 +1,136 @@
 from src.database import Database
-from src.scrapers.base import BaseScraper
+from src.scrapers.base import BaseScraper, create_session
 from src.scrapers.budget_calculator import BudgetCalculatorScraper
-from typing import List
+from src.scrapers.geodata import GeoDataScraper
+from src.scrapers.restcountries import RestCountriesScraper
+from src.scrapers.wikivoyage import WikivoyageScraper
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import asyncio
 import logging
+import queue
+import threading
+import requests
 
 logger = logging.getLogger(__name__)
 
+# Scrapers run by each sync mode ("rare": base data, "frequent": enrichment)
+MODE_SCRAPERS = {
+    "rare": (RestCountriesScraper, GeoDataScraper),
+    "frequent": (WikivoyageScraper,),
+}
+
 class Synchronizer:
-    def __init__(self, db: Database, scrapers: List[BaseScraper]):
+    # Keep-alive connection pool shared by every scraper of a run
+    POOL_SIZE = 20
+    # Fetched batches allowed to wait for the database writer
+    WRITE_QUEUE_SIZE = 4
+    # Budgets written per update_country_budgets call
+    BUDGET_BATCH_SIZE = 500
+
+    def __init__(self, db: Database, scrapers: List[BaseScraper], session: Optional[requests.Session] = None):
         self.db = db
         self.scrapers = scrapers
+        self.session = session or create_session(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE)
+        for scraper in self.scrapers:
+            scraper.session = self.session
+
+        # Active scrapers per mode, resolved once
+        self._by_mode = {
+            mode: [s for s in scrapers if isinstance(s, classes)]
+            for mode, classes in MODE_SCRAPERS.items()
+        }
 
     def run(self, mode: str = "frequent"):
+        asyncio.run(self.run_async(mode))
+
+    async def run_async(self, mode: str = "frequent"):
         logger.info(f"Starting synchronization in mode: {mode.upper()}")
         self.db.connect()
         
         try:
-            active_scrapers = []
-            
             # Filter scrapers based on mode
-            if mode == "rare":
-                # In rare mode, we run base data scrapers
-                active_scrapers = [s for s in self.scrapers if s.__class__.__name__ in ["RestCountriesScraper", "GeoDataScraper"]]
-            elif mode == "frequent":
-                # In frequent mode, we run enrichment scrapers
-                active_scrapers = [s for s in self.scrapers if s.__class__.__name__ in ["WikivoyageScraper"]]
+            if mode in self._by_mode:
+                active_scrapers = self._by_mode[mode]
             elif mode == "budget":
                 # In budget mode, we only run budget calculation
-                self._run_budget_calculation()
+                # (in a worker thread: it drives its own event loop for the LLM phase)
+                await asyncio.to_thread(self._run_budget_calculation)
                 return
             else:
                 logger.warning(f"Unknown mode {mode}, running all scrapers")
                 active_scrapers = self.scrapers
 
-            for scraper in active_scrapers:
-                scraper_name = scraper.__class__.__name__
-                logger.info(f"Running scraper: {scraper_name}")
-                
-                # Countries
-                try:
-                    countries = scraper.fetch_countries()
-                    if countries:
-                        self.db.upsert_countries(countries)
-                except Exception as e:
-                    logger.error(f"Error in {scraper_name} (Countries): {e}")
-                
-                # Cities
-                try:
-                    cities = scraper.fetch_cities()
-                    if cities:
-                        self.db.upsert_cities(cities)
-                except Exception as e:
-                    logger.error(f"Error in {scraper_name} (Cities): {e}")
+            # Scrapers are network-bound: one worker per (scraper, countries|cities) pair
+            # so every fetch overlaps its socket waits with the others
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=max(1, 2 * len(active_scrapers))))
+
+            # A single writer thread owns the database, so upserts overlap the
+            # remaining fetches instead of holding up their worker
+            write_queue: queue.Queue = queue.Queue(maxsize=self.WRITE_QUEUE_SIZE)
+            writer = threading.Thread(target=self._db_writer, args=(write_queue,), daemon=True)
+            writer.start()
+
+            try:
+                jobs = []
+                for scraper in active_scrapers:
+                    scraper_name = type(scraper).__name__
+                    logger.info(f"Running scraper: {scraper_name}")
+                    jobs.append(asyncio.to_thread(self._fetch_countries, scraper, scraper_name, write_queue))
+                    jobs.append(asyncio.to_thread(self._fetch_cities, scraper, scraper_name, write_queue))
+                await asyncio.gather(*jobs)
+            finally:
+                write_queue.put(None)
+                await asyncio.to_thread(writer.join)
                     
         finally:
             self.db.close()
+            self.session.close()
 
         logger.info("Synchronization completed")
 
+    def _fetch_countries(self, scraper: BaseScraper, scraper_name: str, write_queue: queue.Queue):
+        """Fetch the countries of one scraper and hand them to the writer."""
+        try:
+            countries = scraper.fetch_countries()
+            if countries:
+                write_queue.put((scraper_name, "Countries", countries))
+        except Exception as e:
+            logger.error(f"Error in {scraper_name} (Countries): {e}")
+
+    def _fetch_cities(self, scraper: BaseScraper, scraper_name: str, write_queue: queue.Queue):
+        """Fetch the cities of one scraper and hand them to the writer."""
+        try:
+            cities = scraper.fetch_cities()
+            if cities:
+                write_queue.put((scraper_name, "Cities", cities))
+        except Exception as e:
+            logger.error(f"Error in {scraper_name} (Cities): {e}")
+
+    def _db_writer(self, write_queue: queue.Queue):
+        """Upsert queued (scraper_name, kind, rows) batches until the None sentinel."""
+        while (item := write_queue.get()) is not None:
+            scraper_name, kind, rows = item
+            try:
+                if kind == "Countries":
+                    self.db.upsert_countries(rows)
+                else:
+                    self.db.upsert_cities(rows)
+            except Exception as e:
+                logger.error(f"Error in {scraper_name} ({kind}): {e}")
+
     def _run_budget_calculation(self):
-        """Run the budget calculator and update countries."""
+        """Run the budget calculator and update countries batch by batch."""
         logger.info("Running budget calculation...")
 
         budget_scraper = BudgetCalculatorScraper()
-        budgets = budget_scraper.calculate_budgets()
+        updated = 0
+        for batch in budget_scraper.iter_budget_batches(self.BUDGET_BATCH_SIZE):
+            self.db.update_country_budgets(batch)
+            updated += len(batch)
 
-        if budgets:
-            self.db.update_country_budgets(budgets)
-            logger.info(f"Budget calculation completed: {len(budgets)} countries updated")
+        if updated:
+            logger.info(f"Budget calculation completed: {updated} countries updated")
         else:
             logger.warning("No budgets calculated")
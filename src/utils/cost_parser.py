@@ -2,9 +2,14 @@
 import re
 from typing import Optional
 import logging
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# $<digits with optional comma and decimal>
+_USD_RE = re.compile(r'\$([\d,]+\.?\d*)')
+_USD_CHARS = frozenset('0123456789.,')
+
 
 def parse_usd_value(value: str) -> Optional[float]:
     """
@@ -30,8 +35,24 @@ def parse_usd_value(value: str) -> Optional[float]:
     if not value or not value.startswith('$'):
         return None
 
-    # Match: $<digits with optional comma and decimal>
-    match = re.match(r'\$([\d,]+\.?\d*)', value)
+    # Fast path: plain "$131" or "$81(EUR69)" parses without the regex engine
+    end = 1
+    while end < len(value) and value[end] in _USD_CHARS:
+        end += 1
+    # (only when the regex would take the whole run: no ',' after the '.')
+    dot = value.find('.', 1, end)
+    if (
+        end > 1 and value[1].isdigit()
+        and (end == len(value) or value[end] == '(')
+        and (dot == -1 or value.rfind(',', 1, end) < dot)
+    ):
+        try:
+            usd_value = float(value[1:end].replace(',', ''))
+            return usd_value if usd_value >= 0.01 else None
+        except ValueError:
+            pass  # e.g. "$1.2.3": let the regex take the longest valid prefix
+
+    match = _USD_RE.match(value)
     if match:
         usd_str = match.group(1).replace(',', '')
         try:
@@ -61,7 +82,7 @@ def parse_numbeo_index(value: str) -> Optional[float]:
         return None
 
     value = value.strip()
-    if not value:
+    if not value or not (value[0].isdigit() or value[0] in '-+.'):
         return None
 
     try:
@@ -69,3 +90,33 @@ def parse_numbeo_index(value: str) -> Optional[float]:
         return index if index > 0 else None
     except (ValueError, TypeError):
         return None
+
+
+def parse_usd_series(values: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_usd_value for a whole CSV column.
+
+    Args:
+        values: Series of raw strings from CSV
+
+    Returns:
+        Float series with NaN where the value is invalid/missing
+    """
+    usd = values.str.strip().str.extract(r'^\$([\d,]+\.?\d*)', expand=False)
+    usd = pd.to_numeric(usd.str.replace(',', '', regex=False), errors='coerce')
+    # Treat $0.00 as missing data (currency conversion failed)
+    return usd.where(usd >= 0.01)
+
+
+def parse_numbeo_series(values: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_numbeo_index for a whole CSV column.
+
+    Args:
+        values: Series of index value strings from CSV
+
+    Returns:
+        Float series with NaN where the index is invalid
+    """
+    index = pd.to_numeric(values.str.strip(), errors='coerce')
+    return index.where(index > 0)
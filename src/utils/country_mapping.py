@@ -1,7 +1,24 @@
 """Country name to ISO2 code mapping utilities."""
 import logging
+import re
+import sys
+import unicodedata
+from functools import lru_cache
 from typing import Optional, Dict, Tuple
 
+try:
+    import pycountry
+    HAS_PYCOUNTRY = True
+except ImportError:
+    pycountry = None
+    HAS_PYCOUNTRY = False
+
+try:
+    from rapidfuzz import fuzz, process
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
 logger = logging.getLogger(__name__)
 
 # Complete mapping from CSV country names to ISO2 codes
@@ -283,6 +300,54 @@ COUNTRY_NAME_TO_ISO2: Dict[str, str] = {
     "Zimbabwe": "ZW",
 }
 
+# Alternative spellings seen in source data (official/short names)
+COUNTRY_NAME_ALIASES: Dict[str, str] = {
+    "USA": "US",
+    "U.S.A.": "US",
+    "United States of America": "US",
+    "UK": "GB",
+    "Great Britain": "GB",
+    "Russian Federation": "RU",
+    "Czech Republic": "CZ",
+    "Republic of Korea": "KR",
+    "Korea, South": "KR",
+    "Korea, North": "KP",
+    "Democratic Republic of the Congo": "CD",
+    "Congo (Kinshasa)": "CD",
+    "Congo": "CG",
+    "Congo (Brazzaville)": "CG",
+    "Côte d'Ivoire": "CI",
+    "Swaziland": "SZ",
+    "Macedonia": "MK",
+    "Burma": "MM",
+    "East Timor": "TL",
+    "Lao PDR": "LA",
+    "Syrian Arab Republic": "SY",
+    "Viet Nam": "VN",
+}
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_country_name(name: str) -> str:
+    """Fold a country name for lookups: accents stripped (NFKD), whitespace collapsed, lowercased."""
+    folded = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return _WHITESPACE_RE.sub(' ', folded.strip()).lower()
+
+
+# Case/accent/whitespace-insensitive lookup: normalized country name to ISO2
+NORMALIZED_NAME_TO_ISO2: Dict[str, str] = {
+    normalize_country_name(k): v
+    for k, v in {**COUNTRY_NAME_ALIASES, **COUNTRY_NAME_TO_ISO2}.items()
+}
+
+# Minimum rapidfuzz token_sort_ratio score to accept a fuzzy country name match
+FUZZY_MATCH_THRESHOLD = 88
+# Runner-up (another country) scoring within this margin makes the match ambiguous
+FUZZY_MATCH_MARGIN = 5
+_FUZZY_CHOICES = list(NORMALIZED_NAME_TO_ISO2)
+
 # Reverse mapping: ISO2 to country name
 ISO2_TO_COUNTRY_NAME: Dict[str, str] = {v: k for k, v in COUNTRY_NAME_TO_ISO2.items()}
 
@@ -383,51 +448,59 @@ COUNTRY_REGIONS: Dict[str, str] = {
 }
 
 # Neighboring countries for LLM context
-COUNTRY_NEIGHBORS: Dict[str, list] = {
-    "FR": ["DE", "BE", "LU", "CH", "IT", "ES", "AD", "MC"],
-    "DE": ["FR", "BE", "NL", "LU", "CH", "AT", "CZ", "PL", "DK"],
-    "ES": ["FR", "PT", "AD", "MA"],
-    "IT": ["FR", "CH", "AT", "SI", "VA", "SM"],
-    "US": ["CA", "MX"],
-    "CN": ["RU", "MN", "KP", "VN", "LA", "MM", "IN", "BT", "NP", "PK", "AF", "TJ", "KG", "KZ"],
-    "RU": ["NO", "FI", "EE", "LV", "BY", "UA", "GE", "AZ", "KZ", "CN", "MN", "KP"],
-    "BR": ["AR", "UY", "PY", "BO", "PE", "CO", "VE", "GY", "SR", "GF"],
-    "IN": ["PK", "CN", "NP", "BT", "BD", "MM"],
-    "AU": ["NZ", "ID", "PG"],
-    "JP": ["KR", "CN", "TW", "RU"],
-    "GB": ["IE", "FR"],
-    "MX": ["US", "GT", "BZ"],
-    "TH": ["MM", "LA", "KH", "MY"],
-    "VN": ["CN", "LA", "KH"],
-    "EG": ["LY", "SD", "IL", "PS"],
-    "ZA": ["NA", "BW", "ZW", "MZ", "SZ", "LS"],
-    "TR": ["GR", "BG", "GE", "AM", "AZ", "IR", "IQ", "SY"],
-    "SA": ["JO", "IQ", "KW", "BH", "QA", "AE", "OM", "YE"],
-    "PL": ["DE", "CZ", "SK", "UA", "BY", "LT", "RU"],
-    "AR": ["CL", "BO", "PY", "BR", "UY"],
-    "DZ": ["MA", "TN", "LY", "NE", "ML", "MR"],
-    "MA": ["DZ", "EH", "ES"],
-    "ID": ["MY", "PG", "TL", "AU"],
-    "PH": ["TW", "MY", "ID", "VN"],
-    "KR": ["KP", "JP"],
-    "VE": ["CO", "BR", "GY"],
-    "CO": ["VE", "BR", "PE", "EC", "PA"],
-    "PE": ["EC", "CO", "BR", "BO", "CL"],
-    "CL": ["PE", "BO", "AR"],
-    "PK": ["IN", "CN", "AF", "IR"],
-    "BD": ["IN", "MM"],
-    "NG": ["BJ", "NE", "TD", "CM"],
-    "ET": ["ER", "DJ", "SO", "KE", "SS", "SD"],
-    "KE": ["ET", "SO", "TZ", "UG", "SS"],
-    "TZ": ["KE", "UG", "RW", "BI", "CD", "ZM", "MW", "MZ"],
-    "UA": ["RU", "BY", "PL", "SK", "HU", "RO", "MD"],
-    "IR": ["IQ", "TR", "AM", "AZ", "TM", "AF", "PK"],
-    "IQ": ["IR", "TR", "SY", "JO", "SA", "KW"],
-    "SY": ["TR", "IQ", "JO", "IL", "LB"],
-    "AF": ["PK", "IR", "TM", "UZ", "TJ", "CN"],
+COUNTRY_NEIGHBORS: Dict[str, Tuple[str, ...]] = {
+    "FR": ("DE", "BE", "LU", "CH", "IT", "ES", "AD", "MC"),
+    "DE": ("FR", "BE", "NL", "LU", "CH", "AT", "CZ", "PL", "DK"),
+    "ES": ("FR", "PT", "AD", "MA"),
+    "IT": ("FR", "CH", "AT", "SI", "VA", "SM"),
+    "US": ("CA", "MX"),
+    "CN": ("RU", "MN", "KP", "VN", "LA", "MM", "IN", "BT", "NP", "PK", "AF", "TJ", "KG", "KZ"),
+    "RU": ("NO", "FI", "EE", "LV", "BY", "UA", "GE", "AZ", "KZ", "CN", "MN", "KP"),
+    "BR": ("AR", "UY", "PY", "BO", "PE", "CO", "VE", "GY", "SR", "GF"),
+    "IN": ("PK", "CN", "NP", "BT", "BD", "MM"),
+    "AU": ("NZ", "ID", "PG"),
+    "JP": ("KR", "CN", "TW", "RU"),
+    "GB": ("IE", "FR"),
+    "MX": ("US", "GT", "BZ"),
+    "TH": ("MM", "LA", "KH", "MY"),
+    "VN": ("CN", "LA", "KH"),
+    "EG": ("LY", "SD", "IL", "PS"),
+    "ZA": ("NA", "BW", "ZW", "MZ", "SZ", "LS"),
+    "TR": ("GR", "BG", "GE", "AM", "AZ", "IR", "IQ", "SY"),
+    "SA": ("JO", "IQ", "KW", "BH", "QA", "AE", "OM", "YE"),
+    "PL": ("DE", "CZ", "SK", "UA", "BY", "LT", "RU"),
+    "AR": ("CL", "BO", "PY", "BR", "UY"),
+    "DZ": ("MA", "TN", "LY", "NE", "ML", "MR"),
+    "MA": ("DZ", "EH", "ES"),
+    "ID": ("MY", "PG", "TL", "AU"),
+    "PH": ("TW", "MY", "ID", "VN"),
+    "KR": ("KP", "JP"),
+    "VE": ("CO", "BR", "GY"),
+    "CO": ("VE", "BR", "PE", "EC", "PA"),
+    "PE": ("EC", "CO", "BR", "BO", "CL"),
+    "CL": ("PE", "BO", "AR"),
+    "PK": ("IN", "CN", "AF", "IR"),
+    "BD": ("IN", "MM"),
+    "NG": ("BJ", "NE", "TD", "CM"),
+    "ET": ("ER", "DJ", "SO", "KE", "SS", "SD"),
+    "KE": ("ET", "SO", "TZ", "UG", "SS"),
+    "TZ": ("KE", "UG", "RW", "BI", "CD", "ZM", "MW", "MZ"),
+    "UA": ("RU", "BY", "PL", "SK", "HU", "RO", "MD"),
+    "IR": ("IQ", "TR", "AM", "AZ", "TM", "AF", "PK"),
+    "IQ": ("IR", "TR", "SY", "JO", "SA", "KW"),
+    "SY": ("TR", "IQ", "JO", "IL", "LB"),
+    "AF": ("PK", "IR", "TM", "UZ", "TJ", "CN"),
 }
 
+# Share one string object per region/ISO2 code across the long-lived lookup tables
+_REGIONS_INTERN: Dict[str, str] = {r: sys.intern(r) for r in set(COUNTRY_REGIONS.values())}
+COUNTRY_REGIONS = {sys.intern(k): _REGIONS_INTERN[v] for k, v in COUNTRY_REGIONS.items()}
+COUNTRY_NEIGHBORS = {
+    sys.intern(k): tuple(sys.intern(n) for n in v) for k, v in COUNTRY_NEIGHBORS.items()
+}
 
+
+@lru_cache(maxsize=4096)
 def get_iso2_from_name(country_name: str) -> Optional[str]:
     """
     Get ISO2 code from country name.
@@ -443,54 +516,113 @@ def get_iso2_from_name(country_name: str) -> Optional[str]:
 
     name = country_name.strip()
 
-    # Direct lookup
-    if name in COUNTRY_NAME_TO_ISO2:
-        return COUNTRY_NAME_TO_ISO2[name]
+    # Direct lookup, then normalized (case/accent-folded) lookup
+    iso2 = COUNTRY_NAME_TO_ISO2.get(name) or NORMALIZED_NAME_TO_ISO2.get(normalize_country_name(name))
+    if iso2:
+        return iso2
 
-    # Try pycountry as fallback
-    try:
-        import pycountry
+    return _resolve_iso2(name)
 
-        # Exact name match
-        country = pycountry.countries.get(name=name)
-        if country:
-            return country.alpha_2
 
-        # Common name match
-        try:
-            country = pycountry.countries.get(common_name=name)
-            if country:
-                return country.alpha_2
-        except (KeyError, LookupError):
-            pass
+@lru_cache(maxsize=1)
+def _pycountry_index() -> Dict[str, str]:
+    """Normalized pycountry name/common name/official name to ISO2, built on first miss."""
+    index: Dict[str, str] = {}
+    for country in pycountry.countries:
+        for attr in ("name", "common_name", "official_name"):
+            value = getattr(country, attr, None)
+            if value:
+                index.setdefault(normalize_country_name(value), country.alpha_2)
+    return index
+
+
+@lru_cache(maxsize=512)
+def _resolve_iso2(name: str) -> Optional[str]:
+    """Resolve a name missing from the static mapping (cached, including misses)."""
+    # Try pycountry names as fallback
+    if HAS_PYCOUNTRY:
+        iso2 = _pycountry_index().get(normalize_country_name(name))
+        if iso2:
+            return iso2
+    else:
+        logger.debug("pycountry not installed, using static mapping only")
+
+    # Fuzzy search
+    iso2 = _fuzzy_iso2(name)
+    if iso2:
+        return iso2
 
-        # Fuzzy search
+    logger.warning(f"Could not find ISO2 code for country: {name}")
+    return None
+
+
+def _fuzzy_iso2(name: str) -> Optional[str]:
+    """
+    Fuzzy-match a name against the static mapping (rapidfuzz, then pycountry).
+
+    rapidfuzz only accepts near-identical spellings; ambiguous matches and
+    names that merely contain a known country ("Serbia and Montenegro") fall
+    through to pycountry and then None rather than a wrong country.
+    """
+    if HAS_RAPIDFUZZ:
+        iso2 = _rapidfuzz_iso2(normalize_country_name(name))
+        if iso2:
+            return iso2
+
+    if HAS_PYCOUNTRY:
         try:
             results = pycountry.countries.search_fuzzy(name)
             if results:
                 return results[0].alpha_2
         except LookupError:
             pass
+        except Exception as e:
+            logger.debug(f"pycountry fuzzy search failed for {name}: {e}")
 
-    except ImportError:
-        logger.debug("pycountry not installed, using static mapping only")
-    except Exception as e:
-        logger.debug(f"pycountry lookup failed for {name}: {e}")
-
-    logger.warning(f"Could not find ISO2 code for country: {name}")
     return None
 
 
+def _rapidfuzz_iso2(query: str) -> Optional[str]:
+    """Best rapidfuzz match for a normalized name, or None if weak, ambiguous or partial."""
+    matches = process.extract(
+        query,
+        _FUZZY_CHOICES,
+        scorer=fuzz.token_sort_ratio,
+        score_cutoff=FUZZY_MATCH_THRESHOLD,
+        limit=5
+    )
+    if not matches:
+        return None
+
+    best, score, _ = matches[0]
+    iso2 = NORMALIZED_NAME_TO_ISO2[best]
+
+    # Tie with another country: don't guess
+    for other, other_score, _ in matches[1:]:
+        if NORMALIZED_NAME_TO_ISO2[other] != iso2 and score - other_score < FUZZY_MATCH_MARGIN:
+            return None
+
+    # A known name plus extra words is a different entity, not a typo
+    if set(best.split()) < set(query.split()):
+        return None
+
+    return iso2
+
+
+@lru_cache(maxsize=512)
 def get_country_name(iso2: str) -> Optional[str]:
     """Get country name from ISO2 code."""
-    return ISO2_TO_COUNTRY_NAME.get(iso2.upper())
+    return ISO2_TO_COUNTRY_NAME.get(iso2) or ISO2_TO_COUNTRY_NAME.get(iso2.upper())
 
 
+@lru_cache(maxsize=512)
 def get_region(iso2: str) -> str:
     """Get region for a country."""
-    return COUNTRY_REGIONS.get(iso2.upper(), "Unknown")
+    # Keys are stored upper-case; only fold when the raw code misses
+    return COUNTRY_REGIONS.get(iso2) or COUNTRY_REGIONS.get(iso2.upper(), "Unknown")
 
 
-def get_neighbors(iso2: str) -> list:
+@lru_cache(maxsize=512)
+def get_neighbors(iso2: str) -> Tuple[str, ...]:
     """Get neighboring countries for a country."""
-    return COUNTRY_NEIGHBORS.get(iso2.upper(), [])
+    return COUNTRY_NEIGHBORS.get(iso2) or COUNTRY_NEIGHBORS.get(iso2.upper(), ())
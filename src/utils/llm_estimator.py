@@ -1,13 +1,21 @@
 """LLM-based budget estimation for missing or outlier values."""
 import os
+import json
+import hashlib
 import logging
 import asyncio
+import time
 from pathlib import Path
 from typing import Dict, Optional, Tuple, List
+import httpx
+import openai
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 
 # Load .env from parent directories
+# (always: besides the API key it carries the OPENAI_RPM / LLM_* settings read
+# below, and load_dotenv never overrides variables already exported)
 env_paths = [
     Path(__file__).parent.parent.parent / ".env",  # Travliaq-Country-Scrapper/.env
     Path(__file__).parent.parent.parent.parent / "crewtravliaq" / ".env",  # crewtravliaq/.env
@@ -22,54 +30,210 @@ logger = logging.getLogger(__name__)
 MIN_REASONABLE_BUDGET = 10.0   # Minimum reasonable daily budget
 MAX_REASONABLE_BUDGET = 400.0  # Maximum reasonable (excluding luxury destinations)
 
-# Prompt for budget estimation
-ESTIMATION_PROMPT = """Tu es un expert en coût de la vie et voyage international.
-Estime le budget journalier mid-range (USD) pour un voyageur dans ce pays.
+# Model used for estimations (low latency matters more than depth here)
+LLM_MODEL = os.getenv("LLM_ESTIMATOR_MODEL", "gpt-4.1-mini")
+
+# Per-request bounds for LLM calls
+MAX_OUTPUT_TOKENS = 20         # Per country: {"iso2":..,"min":..,"max":..} (~15 tokens)
+REQUEST_TIMEOUT = 20.0         # Seconds per request
+MAX_RETRIES = 3                # Attempts per request on throttling/transient errors
+MAX_CONNECTIONS = 20           # Keep-alive pool of the shared client
+LLM_CHUNK_SIZE = 20            # Countries estimated per multi-country request
+OPENAI_RPM = float(os.getenv("OPENAI_RPM", "500"))  # Requests per minute allowed to the API
+
+# On-disk cache of estimates, keyed by model + prompt inputs
+LLM_CACHE_DIR = Path(__file__).parent.parent.parent / ".cache" / "llm_estimator"
+LLM_CACHE_TTL_SECONDS = 30 * 24 * 3600  # 30 days
+LLM_CACHE_DISABLE = os.getenv("LLM_CACHE_DISABLE", "0") == "1"
+
+# Errors worth retrying (APITimeoutError is a subclass of APIConnectionError)
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+# Shared client, bound to the event loop it was created on
+_client: Optional[AsyncOpenAI] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Structured output: {"budgets": [{"iso2", "min", "max"}, ...]}
+# (strict schemas need an object at the root, hence the wrapper key)
+BATCH_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "budgets",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "budgets": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "iso2": {"type": "string"},
+                            "min": {"type": "number"},
+                            "max": {"type": "number"}
+                        },
+                        "required": ["iso2", "min", "max"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["budgets"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Prompt for multi-country estimation: the system message is static (identical
+# for every call, so the API can reuse its cached prefix) and the countries go
+# in the user message as one JSON list per request
+BATCH_SYSTEM_PROMPT = """Expert coût de la vie. Pour chaque pays de la liste JSON donnée, estime le budget journalier mid-range USD d'un voyageur (hôtel 3★, 3 repas locaux, transport local, 1-2 activités).
+"valeur_actuelle", si présente, est probablement erronée: ne la reprends pas.
+Réponds avec min et max pour chaque iso2."""
+
+
+class TokenBucket:
+    """Async token bucket: bursts up to max_rate, then paces at max_rate per time_period."""
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        """
+        Initialize the bucket (full).
+
+        Args:
+            max_rate: Tokens per time_period (also the burst capacity)
+            time_period: Refill period in seconds
+        """
+        self.capacity = max(max_rate, 1.0)
+        self.rate = self.capacity / time_period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until it is refilled if the bucket is empty."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        # Reserve the token now (possibly going negative) so concurrent
+        # callers queue behind each other instead of waking together
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+    async def __aenter__(self) -> "TokenBucket":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+# Shared across every estimation coroutine of the process
+_limiter = TokenBucket(OPENAI_RPM, 60.0)
+
+
+def _get_client() -> AsyncOpenAI:
+    """
+    Return the module-level client so calls reuse its keep-alive connections.
 
-Pays: {country_name}
-Région: {region}
-Pays voisins avec budgets connus: {neighbors}
-Indice Numbeo (si disponible): {numbeo_index}
+    httpx pools are tied to an event loop, so a new client is created when
+    called from a different loop (each asyncio.run of the budget calculator).
+    """
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            max_retries=0,  # Retries are handled by _create_completion
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS
+                )
+            )
+        )
+        _client_loop = loop
 
-Le budget mid-range inclut:
-- Hôtel 3 étoiles
-- 3 repas/jour (restaurants locaux)
-- Transport local
-- 1-2 activités touristiques
+    return _client
 
-IMPORTANT: Réponds UNIQUEMENT avec deux nombres séparés par une virgule.
-Le premier est le budget MINIMUM, le second est le budget MAXIMUM.
-Format: min,max
-Exemple: 65,95
 
-Ne mets pas de symbole dollar, juste les nombres."""
+async def _create_completion(request_timeout: float, max_retries: int, **request):
+    """
+    Send a chat completion, retrying throttling/transient errors with jittered backoff.
 
-# Prompt for correcting outliers
-CORRECTION_PROMPT = """Tu es un expert en coût de la vie et voyage international.
-La valeur suivante semble être une erreur dans nos données:
+    Each attempt takes its own rate limiter token.
+    """
+    client = _get_client()
+
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(max(max_retries, 1)),
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        reraise=True
+    ):
+        with attempt:
+            async with _limiter:
+                return await client.chat.completions.create(
+                    model=LLM_MODEL,
+                    temperature=0,
+                    timeout=request_timeout,
+                    **request
+                )
 
-Pays: {country_name}
-Région: {region}
-Valeur actuelle: ${current_value}/jour (probablement erronée)
-Pays voisins avec budgets connus: {neighbors}
-Indice Numbeo: {numbeo_index}
 
-Cette valeur semble {issue}.
+def _cache_key(*parts) -> str:
+    """Stable key for a request (model and every prompt input)."""
+    raw = "|".join(str(part) for part in (LLM_MODEL, *parts))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
 
-Estime le budget journalier mid-range RÉEL pour ce pays.
 
-Le budget mid-range inclut:
-- Hôtel 3 étoiles
-- 3 repas/jour (restaurants locaux)
-- Transport local
-- 1-2 activités touristiques
+def _cache_get(key: str) -> Optional[Tuple[float, float]]:
+    """Return a cached (min, max) estimate, or None if missing/expired/disabled."""
+    if LLM_CACHE_DISABLE:
+        return None
 
-IMPORTANT: Réponds UNIQUEMENT avec deux nombres séparés par une virgule.
-Le premier est le budget MINIMUM, le second est le budget MAXIMUM.
-Format: min,max
-Exemple: 45,70
+    try:
+        with open(LLM_CACHE_DIR / f"{key}.json", "r", encoding="utf-8") as f:
+            entry = json.load(f)
+
+        if time.time() - entry.get("cached_at", 0) > LLM_CACHE_TTL_SECONDS:
+            return None
+
+        min_budget, max_budget = entry["budget"]
+        return (float(min_budget), float(max_budget))
+    except (OSError, KeyError, TypeError, ValueError, AttributeError):
+        # Missing, truncated or hand-edited entry: treat as a miss
+        return None
 
-Ne mets pas de symbole dollar, juste les nombres."""
+
+def _cache_set(key: str, budget: Tuple[float, float]) -> None:
+    """Store a (min, max) estimate."""
+    if LLM_CACHE_DISABLE:
+        return
+
+    try:
+        LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(LLM_CACHE_DIR / f"{key}.json", "w", encoding="utf-8") as f:
+            json.dump({"cached_at": time.time(), "budget": list(budget)}, f)
+    except OSError as e:
+        logger.debug(f"Could not cache LLM estimate: {e}")
+
+
+def _budget_range(data: Dict) -> Tuple[float, float]:
+    """Ordered, rounded (min, max) tuple from a {"min", "max"} answer."""
+    min_budget, max_budget = float(data["min"]), float(data["max"])
+    # Ensure min <= max
+    if min_budget > max_budget:
+        min_budget, max_budget = max_budget, min_budget
+    return (round(min_budget, 2), round(max_budget, 2))
+
+
+def _format_neighbors(neighbors_budgets: Dict[str, Tuple[float, float]]) -> str:
+    """Prompt line for neighbor budgets ("Name: $min-$max, ...")."""
+    return ", ".join([
+        f"{name}: ${min_b:.0f}-${max_b:.0f}"
+        for name, (min_b, max_b) in neighbors_budgets.items()
+    ]) or "Non disponibles"
 
 
 def is_outlier(budget: float) -> bool:
@@ -86,135 +250,82 @@ def get_outlier_issue(budget: float) -> str:
     return ""
 
 
-async def estimate_budget_llm(
-    country_name: str,
-    region: str,
-    neighbors_budgets: Dict[str, Tuple[float, float]],
-    numbeo_index: Optional[float] = None
-) -> Tuple[float, float]:
+async def _estimate_chunk(
+    items: List[Dict],
+    max_output_tokens: int = MAX_OUTPUT_TOKENS,
+    request_timeout: float = REQUEST_TIMEOUT,
+    max_retries: int = MAX_RETRIES
+) -> Dict[str, Tuple[float, float]]:
     """
-    Use GPT-4o-mini to estimate a reasonable budget range.
+    Estimate several countries with a single request.
 
     Args:
-        country_name: Name of the country
-        region: Geographic region
-        neighbors_budgets: Dict of neighbor ISO2 -> (min, max) budgets
-        numbeo_index: Numbeo cost of living index if available
+        items: Prompt items, each with an "iso2" key plus country fields
+        max_output_tokens: Completion token cap per country
+        request_timeout: Per-request timeout in seconds
+        max_retries: Attempts on throttling/transient errors
 
     Returns:
-        Tuple of (min_budget, max_budget) in USD
+        Dict mapping ISO2 -> (min, max) budget for the countries answered
     """
-    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-    neighbors_str = ", ".join(
-        f"{name}: ${min_b:.0f}-${max_b:.0f}"
-        for name, (min_b, max_b) in neighbors_budgets.items()
-    ) if neighbors_budgets else "Non disponibles"
-
-    try:
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{
-                "role": "user",
-                "content": ESTIMATION_PROMPT.format(
-                    country_name=country_name,
-                    region=region,
-                    neighbors=neighbors_str,
-                    numbeo_index=f"{numbeo_index:.1f}" if numbeo_index else "Non disponible"
-                )
-            }],
-            temperature=0.3,
-            max_tokens=30
-        )
-
-        result = response.choices[0].message.content.strip()
-        parts = result.replace(" ", "").split(",")
-
-        if len(parts) >= 2:
-            min_budget = float(parts[0])
-            max_budget = float(parts[1])
-            # Ensure min <= max
-            if min_budget > max_budget:
-                min_budget, max_budget = max_budget, min_budget
-            return (round(min_budget, 2), round(max_budget, 2))
-
-        # If only one value, create a range
-        single_value = float(parts[0])
-        return (round(single_value * 0.8, 2), round(single_value * 1.2, 2))
+    response = await _create_completion(
+        request_timeout,
+        max_retries,
+        messages=[
+            {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(items, ensure_ascii=False)}
+        ],
+        max_tokens=max_output_tokens * len(items) + 20,
+        response_format=BATCH_RESPONSE_FORMAT
+    )
+
+    requested = {item["iso2"] for item in items}
+    results = {}
+    for entry in json.loads(response.choices[0].message.content)["budgets"]:
+        if entry["iso2"] in requested:
+            results[entry["iso2"]] = _budget_range(entry)
+    return results
 
-    except Exception as e:
-        logger.error(f"LLM estimation failed for {country_name}: {e}")
-        raise
 
 
-async def correct_outlier_llm(
-    country_name: str,
-    region: str,
-    current_value: float,
-    neighbors_budgets: Dict[str, Tuple[float, float]],
-    numbeo_index: Optional[float] = None
-) -> Tuple[float, float]:
+async def _estimate_and_store(
+    items: List[Dict],
+    results: Dict[str, Tuple[float, float]],
+    **limits
+) -> None:
     """
-    Use GPT-4o-mini to correct an outlier budget value.
+    Estimate one chunk, then record and cache its budgets right away.
 
-    Args:
-        country_name: Name of the country
-        region: Geographic region
-        current_value: Current outlier value
-        neighbors_budgets: Dict of neighbor ISO2 -> (min, max) budgets
-        numbeo_index: Numbeo cost of living index if available
+    Storing per chunk keeps finished chunks when the overall run is cut short.
 
-    Returns:
-        Tuple of (min_budget, max_budget) in USD
+    Args:
+        items: Prompt items of the chunk
+        results: Shared ISO2 -> (min, max) dict filled in place
+        **limits: Request limits passed to _estimate_chunk
     """
-    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-    neighbors_str = ", ".join(
-        f"{name}: ${min_b:.0f}-${max_b:.0f}"
-        for name, (min_b, max_b) in neighbors_budgets.items()
-    ) if neighbors_budgets else "Non disponibles"
-
-    issue = get_outlier_issue(current_value)
-
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{
-                "role": "user",
-                "content": CORRECTION_PROMPT.format(
-                    country_name=country_name,
-                    region=region,
-                    current_value=f"{current_value:.2f}",
-                    neighbors=neighbors_str,
-                    numbeo_index=f"{numbeo_index:.1f}" if numbeo_index else "Non disponible",
-                    issue=issue
-                )
-            }],
-            temperature=0.3,
-            max_tokens=30
-        )
-
-        result = response.choices[0].message.content.strip()
-        parts = result.replace(" ", "").split(",")
-
-        if len(parts) >= 2:
-            min_budget = float(parts[0])
-            max_budget = float(parts[1])
-            if min_budget > max_budget:
-                min_budget, max_budget = max_budget, min_budget
-            return (round(min_budget, 2), round(max_budget, 2))
-
-        single_value = float(parts[0])
-        return (round(single_value * 0.8, 2), round(single_value * 1.2, 2))
-
+        chunk_result = await _estimate_chunk(items, **limits)
     except Exception as e:
-        logger.error(f"LLM correction failed for {country_name}: {e}")
-        raise
-
+        logger.error(f"Multi-country LLM estimation failed for {len(items)} countries: {e}")
+        chunk_result = {}
+
+    for item in items:
+        iso2 = item["iso2"]
+        budget = chunk_result.get(iso2)
+        if budget is None:
+            logger.error(f"Failed to estimate {iso2}")
+            continue
+        results[iso2] = budget
+        _cache_set(_cache_key(BATCH_SYSTEM_PROMPT, json.dumps(item, sort_keys=True)), budget)
+        logger.info(f"LLM estimated {iso2}: ${budget[0]:.0f}-${budget[1]:.0f}/day")
 
 async def batch_estimate_budgets(
     countries_to_estimate: List[Dict],
-    known_budgets: Dict[str, Tuple[float, float]]
+    known_budgets: Dict[str, Tuple[float, float]],
+    max_output_tokens: int = MAX_OUTPUT_TOKENS,
+    request_timeout: float = REQUEST_TIMEOUT,
+    max_retries: int = MAX_RETRIES,
+    wall_timeout: Optional[float] = None
 ) -> Dict[str, Tuple[float, float]]:
     """
     Batch estimate budgets for multiple countries using LLM.
@@ -222,60 +333,75 @@ async def batch_estimate_budgets(
     Args:
         countries_to_estimate: List of dicts with country info
         known_budgets: Already calculated budgets for context
+        max_output_tokens: Completion token cap per country
+        request_timeout: Per-request timeout in seconds
+        max_retries: Retries per request on throttling/transient errors
+        wall_timeout: Overall time budget in seconds (None for no limit);
+            chunks still running are cancelled, finished ones are kept
 
     Returns:
-        Dict mapping ISO2 -> (min, max) budget
+        Dict mapping ISO2 -> (min, max) budget; countries that could not be
+        estimated are missing
     """
     from src.utils.country_mapping import get_neighbors, get_country_name
 
     results = {}
-
-    # Process in batches to avoid rate limits
-    batch_size = 5
-    for i in range(0, len(countries_to_estimate), batch_size):
-        batch = countries_to_estimate[i:i + batch_size]
-
-        tasks = []
-        for country_info in batch:
-            iso2 = country_info["iso2"]
-            name = country_info["name"]
-            region = country_info["region"]
-            numbeo_index = country_info.get("numbeo_index")
-            current_value = country_info.get("current_value")
-
-            # Get neighbor budgets for context
-            neighbor_codes = get_neighbors(iso2)
-            neighbor_budgets = {}
-            for nc in neighbor_codes:
-                if nc in known_budgets:
-                    neighbor_name = get_country_name(nc)
-                    if neighbor_name:
-                        neighbor_budgets[neighbor_name] = known_budgets[nc]
-
-            if current_value is not None and is_outlier(current_value):
-                # Correct outlier
-                tasks.append((
-                    iso2,
-                    correct_outlier_llm(name, region, current_value, neighbor_budgets, numbeo_index)
-                ))
-            else:
-                # Estimate from scratch
-                tasks.append((
-                    iso2,
-                    estimate_budget_llm(name, region, neighbor_budgets, numbeo_index)
-                ))
-
-        # Execute batch
-        for iso2, task in tasks:
-            try:
-                result = await task
-                results[iso2] = result
-                logger.info(f"LLM estimated {iso2}: ${result[0]:.0f}-${result[1]:.0f}/day")
-            except Exception as e:
-                logger.error(f"Failed to estimate {iso2}: {e}")
-
-        # Small delay between batches to avoid rate limits
-        if i + batch_size < len(countries_to_estimate):
-            await asyncio.sleep(1)
+    limits = {
+        "max_output_tokens": max_output_tokens,
+        "request_timeout": request_timeout,
+        "max_retries": max_retries
+    }
+
+    # Resolve every neighbor with a known budget once for the whole run
+    neighbor_names = {
+        nc: name
+        for nc in {nc for country_info in countries_to_estimate for nc in get_neighbors(country_info["iso2"])}
+        if nc in known_budgets and (name := get_country_name(nc))
+    }
+
+    # Build one prompt item per country; cached countries skip the API
+    items = []
+    for country_info in countries_to_estimate:
+        iso2 = country_info["iso2"]
+        numbeo_index = country_info.get("numbeo_index")
+        current_value = country_info.get("current_value")
+
+        # Get neighbor budgets for context
+        neighbor_budgets = {
+            neighbor_names[nc]: known_budgets[nc]
+            for nc in get_neighbors(iso2)
+            if nc in neighbor_names
+        }
+
+        item = {
+            "iso2": iso2,
+            "pays": country_info["name"],
+            "region": country_info["region"],
+            "voisins": _format_neighbors(neighbor_budgets),
+            "numbeo": round(numbeo_index, 1) if numbeo_index else None
+        }
+        if current_value is not None and is_outlier(current_value):
+            item["valeur_actuelle"] = f"${current_value:.2f}/jour, {get_outlier_issue(current_value)}"
+
+        cached = _cache_get(_cache_key(BATCH_SYSTEM_PROMPT, json.dumps(item, sort_keys=True)))
+        if cached:
+            results[iso2] = cached
+        else:
+            items.append(item)
+
+    # One request per chunk of countries; the shared token bucket paces them
+    chunks = [items[i:i + LLM_CHUNK_SIZE] for i in range(0, len(items), LLM_CHUNK_SIZE)]
+    tasks = [asyncio.ensure_future(_estimate_and_store(chunk, results, **limits)) for chunk in chunks]
+
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=wall_timeout)
+        if pending:
+            logger.error(
+                f"LLM estimation exceeded {wall_timeout}s wall-clock budget, "
+                f"cancelling {len(pending)} of {len(tasks)} requests"
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
     return results
@@ -0,0 +1,47 @@
+"""
+Quick regression check for country name to ISO2 resolution.
+
+Covers names that a loose fuzzy match used to resolve to the wrong country.
+
+Usage:
+    python test_country_mapping.py
+"""
+
+from src.utils.country_mapping import get_iso2_from_name
+
+# Source name -> expected ISO2 (None: must stay unresolved rather than guessed)
+EXPECTED = {
+    "France": "FR",
+    "Korea, South": "KR",
+    "Argentinia": "AR",
+    "Kyrgystan": "KG",
+    "Congo (Kinshasa)": "CD",
+    "Congo (Brazzaville)": "CG",
+    "Northern Ireland": "GB",
+    "Netherlands Antilles": None,
+    "Serbia and Montenegro": None,
+}
+
+
+def test_country_mapping():
+    """Check every EXPECTED name resolves to its ISO2 code."""
+    failures = {}
+    for name, expected in EXPECTED.items():
+        iso2 = get_iso2_from_name(name)
+        if iso2 != expected:
+            failures[name] = (iso2, expected)
+
+    for name, (iso2, expected) in failures.items():
+        print(f"❌ {name}: {iso2} (attendu: {expected})")
+
+    assert not failures, f"{len(failures)} nom(s) mal résolu(s)"
+
+
+if __name__ == "__main__":
+    try:
+        test_country_mapping()
+        print(f"✅ {len(EXPECTED)} noms résolus correctement")
+        exit(0)
+    except AssertionError as e:
+        print(f"\n❌ ÉCHEC: {e}")
+        exit(1)
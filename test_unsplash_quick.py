@@ -9,6 +9,7 @@ Usage:
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.scrapers.unsplash_photos import UnsplashPhotoScraper, get_country_photo_with_fallbacks
 from src.config import settings
 
@@ -55,27 +56,35 @@ def test_unsplash_api():
         "failed": 0
     }
 
-    for country in test_countries:
-        print(f"🔍 Recherche photo pour: {country}")
-
-        try:
-            photo_data = get_country_photo_with_fallbacks(scraper, country)
-
-            if photo_data:
-                print(f"   ✅ SUCCÈS!")
-                print(f"   📸 URL: {photo_data['photo_url'][:70]}...")
-                print(f"   👤 Crédit: {photo_data['photo_credit']}")
-                print(f"   🔗 Source: {photo_data['photo_source']}")
-                results["success"] += 1
-            else:
-                print(f"   ❌ Aucune photo trouvée")
+    # Fetch all countries concurrently; results are printed as they complete
+    with ThreadPoolExecutor(max_workers=len(test_countries)) as executor:
+        futures = {
+            executor.submit(get_country_photo_with_fallbacks, scraper, country): country
+            for country in test_countries
+        }
+
+        for future in as_completed(futures):
+            country = futures[future]
+            print(f"🔍 Recherche photo pour: {country}")
+
+            try:
+                photo_data = future.result()
+
+                if photo_data:
+                    print(f"   ✅ SUCCÈS!")
+                    print(f"   📸 URL: {photo_data['photo_url'][:70]}...")
+                    print(f"   👤 Crédit: {photo_data['photo_credit']}")
+                    print(f"   🔗 Source: {photo_data['photo_source']}")
+                    results["success"] += 1
+                else:
+                    print(f"   ❌ Aucune photo trouvée")
+                    results["failed"] += 1
+
+            except Exception as e:
+                print(f"   ❌ ERREUR: {e}")
                 results["failed"] += 1
 
-        except Exception as e:
-            print(f"   ❌ ERREUR: {e}")
-            results["failed"] += 1
-
-        print()  # Empty line between countries
+            print()  # Empty line between countries
 
     # Summary
     print("-" * 70)
@@ -12,10 +12,11 @@ Options:
 """
 
 import sys
-import json
 import logging
 import argparse
+from collections import defaultdict
 from typing import Dict, List
+import orjson
 from src.database import Database
 from src.config import settings
 
@@ -29,6 +30,9 @@ logger = logging.getLogger(__name__)
 class PhotosVerifier:
     """Vérifie l'état des photos de pays dans MongoDB."""
 
+    # {"photo_url": None} couvre à la fois les champs absents et null
+    MISSING_PHOTO = {"photo_url": None}
+
     def __init__(self, db: Database):
         self.db = db
         self.collection = db.db.countries
@@ -44,11 +48,53 @@ class PhotosVerifier:
         print("🔍 VÉRIFICATION DES PHOTOS DE PAYS")
         print("=" * 70 + "\n")
 
+        # Toutes les statistiques en un seul aller-retour ($facet)
+        has_photo = {"photo_url": {"$exists": True, "$ne": None}}
+        pipeline = [
+            {
+                "$facet": {
+                    "total": [{"$count": "n"}],
+                    "with_photo": [{"$match": has_photo}, {"$count": "n"}],
+                    "no_credit": [
+                        {"$match": {**has_photo, "photo_credit": {"$exists": False}}},
+                        {"$count": "n"}
+                    ],
+                    "no_source": [
+                        {"$match": {**has_photo, "photo_source": {"$exists": False}}},
+                        {"$count": "n"}
+                    ],
+                    "by_region": [
+                        {
+                            "$group": {
+                                "_id": "$region",
+                                "total": {"$sum": 1},
+                                "with_photo": {
+                                    "$sum": {
+                                        "$cond": [
+                                            {"$and": [
+                                                {"$ifNull": ["$photo_url", False]},
+                                                {"$ne": ["$photo_url", None]}
+                                            ]},
+                                            1,
+                                            0
+                                        ]
+                                    }
+                                }
+                            }
+                        },
+                        {"$sort": {"total": -1}}
+                    ]
+                }
+            }
+        ]
+        facets = next(self.collection.aggregate(pipeline, allowDiskUse=True))
+
+        def facet_count(name: str) -> int:
+            return facets[name][0]["n"] if facets[name] else 0
+
         # Statistiques globales
-        total = self.collection.count_documents({})
-        with_photo = self.collection.count_documents({
-            "photo_url": {"$exists": True, "$ne": None}
-        })
+        total = facet_count("total")
+        with_photo = facet_count("with_photo")
         without_photo = total - with_photo
 
         percentage = (with_photo / total * 100) if total > 0 else 0
@@ -65,17 +111,11 @@ class PhotosVerifier:
         print("-" * 70)
 
         # Pays avec photo mais sans crédit
-        no_credit = self.collection.count_documents({
-            "photo_url": {"$exists": True, "$ne": None},
-            "photo_credit": {"$exists": False}
-        })
+        no_credit = facet_count("no_credit")
         print(f"Photos sans crédit:      {no_credit}")
 
         # Pays avec photo mais sans source
-        no_source = self.collection.count_documents({
-            "photo_url": {"$exists": True, "$ne": None},
-            "photo_source": {"$exists": False}
-        })
+        no_source = facet_count("no_source")
         print(f"Photos sans source:      {no_source}")
         print()
 
@@ -83,31 +123,7 @@ class PhotosVerifier:
         print("🌍 STATISTIQUES PAR RÉGION")
         print("-" * 70)
 
-        pipeline = [
-            {
-                "$group": {
-                    "_id": "$region",
-                    "total": {"$sum": 1},
-                    "with_photo": {
-                        "$sum": {
-                            "$cond": [
-                                {"$and": [
-                                    {"$ifNull": ["$photo_url", False]},
-                                    {"$ne": ["$photo_url", None]}
-                                ]},
-                                1,
-                                0
-                            ]
-                        }
-                    }
-                }
-            },
-            {"$sort": {"total": -1}}
-        ]
-
-        regions = list(self.collection.aggregate(pipeline))
-
-        for region in regions:
+        for region in facets["by_region"]:
             region_name = region["_id"] or "Non défini"
             total_region = region["total"]
             with_photo_region = region["with_photo"]
@@ -120,32 +136,26 @@ class PhotosVerifier:
         print("❌ PAYS SANS PHOTO")
         print("=" * 70 + "\n")
 
-        countries_without_photo = list(self.collection.find(
-            {
-                "$or": [
-                    {"photo_url": {"$exists": False}},
-                    {"photo_url": None}
-                ]
-            },
+        # Un seul passage sur le curseur: liste et regroupement par région
+        countries_without_photo: List[Dict] = []
+        by_region: Dict[str, List[Dict]] = defaultdict(list)
+        cursor = self.collection.find(
+            self.MISSING_PHOTO,
             {
                 "name": 1,
                 "code_iso2": 1,
                 "region": 1,
                 "_id": 0
             }
-        ).sort("name", 1))
+        ).sort("name", 1).batch_size(500)
+
+        for country in cursor:
+            countries_without_photo.append(country)
+            by_region[country.get("region") or "Non défini"].append(country)
 
         if countries_without_photo:
             print(f"Total: {len(countries_without_photo)} pays\n")
 
-            # Grouper par région
-            by_region: Dict[str, List[Dict]] = {}
-            for country in countries_without_photo:
-                region = country.get("region", "Non défini")
-                if region not in by_region:
-                    by_region[region] = []
-                by_region[region].append(country)
-
             for region, countries in sorted(by_region.items()):
                 print(f"\n{region} ({len(countries)} pays):")
                 print("-" * 70)
@@ -159,7 +169,7 @@ class PhotosVerifier:
         print("✅ EXEMPLES DE PAYS AVEC PHOTO")
         print("=" * 70 + "\n")
 
-        examples = list(self.collection.find(
+        examples = self.collection.find(
             {"photo_url": {"$exists": True, "$ne": None}},
             {
                 "name": 1,
@@ -168,7 +178,7 @@ class PhotosVerifier:
                 "photo_credit": 1,
                 "_id": 0
             }
-        ).limit(5))
+        ).limit(5)
 
         for country in examples:
             print(f"🌍 {country['name']} ({country['code_iso2']})")
@@ -193,13 +203,8 @@ class PhotosVerifier:
         Args:
             filename: Nom du fichier de sortie
         """
-        countries_without_photo = list(self.collection.find(
-            {
-                "$or": [
-                    {"photo_url": {"$exists": False}},
-                    {"photo_url": None}
-                ]
-            },
+        cursor = self.collection.find(
+            self.MISSING_PHOTO,
             {
                 "name": 1,
                 "code_iso2": 1,
@@ -207,10 +212,11 @@ class PhotosVerifier:
                 "capital": 1,
                 "_id": 0
             }
-        ).sort("name", 1))
+        ).sort("name", 1).batch_size(1000)
+        countries_without_photo = list(cursor)
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(countries_without_photo, f, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(countries_without_photo, option=orjson.OPT_INDENT_2))
 
         print(f"\n✅ Liste exportée dans {filename}")
         print(f"   {len(countries_without_photo)} pays sans photo")